@@ -8,11 +8,6 @@ LAMMPS module global members:
    result of :py:func:`lammps.version`.
 """
 
-from .constants import *
-from .core import *
-from .data import *
-from .pylammps import *
-
 # convert module string version to numeric version
 def get_version_number():
     import time
@@ -36,3 +31,11 @@ def get_version_number():
     return t.tm_year*10000 + t.tm_mon*100 + t.tm_mday
 
 __version__ = get_version_number()
+
+# the version must be set before importing the other modules,
+# since the lammps class compares it to the shared library version
+
+from .constants import *
+from .core import *
+from .data import *
+from .pylammps import *
@@ -18,16 +18,306 @@ from __future__ import print_function
 
 import os
 import sys
-import traceback
-import types
-import warnings
-from ctypes import *
+import platform
+from ctypes import CDLL, CFUNCTYPE, POINTER, RTLD_GLOBAL, Array, byref, c_char, c_char_p, cast, \
+                   c_double, c_int, c_int32, c_int64, c_void_p, \
+                   create_string_buffer, memmove, py_object, pythonapi, sizeof
 from os.path import dirname,abspath,join
 from inspect import getsourcefile
 
+from . import __version__ as _MODULE_VERSION
 from .constants import *
 from .data import *
 
+# pointer types for the data returned by the extract functions.  these are
+# created once, so that they don't need to be looked up on every call.
+
+_P_INT = POINTER(c_int)
+_P_INT32 = POINTER(c_int32)
+_PP_INT32 = POINTER(_P_INT32)
+_P_INT64 = POINTER(c_int64)
+_PP_INT64 = POINTER(_P_INT64)
+_P_DOUBLE = POINTER(c_double)
+_PP_DOUBLE = POINTER(_P_DOUBLE)
+
+# return types of lammps_extract_atom() for each data type constant
+
+_EXTRACT_ATOM_RESTYPES = {
+  LAMMPS_INT       : _P_INT32,
+  LAMMPS_INT_2D    : _PP_INT32,
+  LAMMPS_DOUBLE    : _P_DOUBLE,
+  LAMMPS_DOUBLE_2D : _PP_DOUBLE,
+  LAMMPS_INT64     : _P_INT64,
+  LAMMPS_INT64_2D  : _PP_INT64,
+}
+
+# return types of lammps_extract_compute() and lammps_extract_fix() for each
+# valid combination of style and type and whether the value or the pointer
+# is returned.  global scalars, vectors and arrays of fixes and global scalars
+# of computes are returned as copies through the fast library (return type None).
+
+_EXTRACT_COMPUTE = {
+  (LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR) : (None, True),
+  (LMP_STYLE_LOCAL,  LMP_TYPE_SCALAR) : (_P_INT, True),
+}
+for _style in (LMP_STYLE_GLOBAL, LMP_STYLE_ATOM, LMP_STYLE_LOCAL):
+  _EXTRACT_COMPUTE[(_style, LMP_TYPE_VECTOR)] = (_P_DOUBLE, False)
+  _EXTRACT_COMPUTE[(_style, LMP_TYPE_ARRAY)] = (_PP_DOUBLE, False)
+  _EXTRACT_COMPUTE[(_style, LMP_SIZE_COLS)] = (_P_INT, True)
+for _style in (LMP_STYLE_GLOBAL, LMP_STYLE_LOCAL):
+  _EXTRACT_COMPUTE[(_style, LMP_SIZE_VECTOR)] = (_P_INT, True)
+  _EXTRACT_COMPUTE[(_style, LMP_SIZE_ROWS)] = (_P_INT, True)
+
+_EXTRACT_FIX = {
+  (LMP_STYLE_ATOM,  LMP_TYPE_VECTOR) : (_P_DOUBLE, False),
+  (LMP_STYLE_ATOM,  LMP_TYPE_ARRAY)  : (_PP_DOUBLE, False),
+  (LMP_STYLE_ATOM,  LMP_SIZE_COLS)   : (_P_INT, True),
+  (LMP_STYLE_LOCAL, LMP_TYPE_VECTOR) : (_P_DOUBLE, False),
+  (LMP_STYLE_LOCAL, LMP_TYPE_ARRAY)  : (_PP_DOUBLE, False),
+}
+for _type in (LMP_TYPE_SCALAR, LMP_TYPE_VECTOR, LMP_TYPE_ARRAY):
+  _EXTRACT_FIX[(LMP_STYLE_GLOBAL, _type)] = (None, True)
+for _type in (LMP_SIZE_VECTOR, LMP_SIZE_ROWS, LMP_SIZE_COLS):
+  _EXTRACT_FIX[(LMP_STYLE_GLOBAL, _type)] = (_P_INT, True)
+  _EXTRACT_FIX[(LMP_STYLE_LOCAL, _type)] = (_P_INT, True)
+_EXTRACT_FIX[(LMP_STYLE_LOCAL, LMP_TYPE_SCALAR)] = (_P_INT, True)
+del _style, _type
+
+# -------------------------------------------------------------------------
+# determine location of the shared library and guess its extension based
+# on the OS, if not inferred from an actual file.  This does not change
+# between instances, so it is done only once when the module is imported.
+
+def _find_library_location():
+  modpath = dirname(abspath(getsourcefile(lambda:0)))
+  # for windows installers the shared library is in a different folder
+  winpath = abspath(join(modpath,'..','..','bin'))
+
+  # match any "machine" name, e.g. liblammps_mpi.dll, not just liblammps.dll
+  for path, ext in ((modpath,'.dylib'), (modpath,'.dll'), (winpath,'.dll'), (modpath,'.so')):
+    if not os.path.isdir(path): continue
+    if any([f.startswith('liblammps') and f.endswith(ext) for f in os.listdir(path)]):
+      return path, ext
+
+  system = platform.system()
+  if system == "Darwin":
+    lib_ext = ".dylib"
+  elif system == "Windows":
+    lib_ext = ".dll"
+  else:
+    lib_ext = ".so"
+  return modpath, lib_ext
+
+_LIB_DIR, _LIB_EXT = _find_library_location()
+
+# full path to load the shared library from for a given "machine" name.
+# only paths of files that were found are cached, otherwise the bare
+# library name is returned and the search is repeated on the next call.
+
+_library_paths = {}
+
+def _library_path(name):
+  libpath = _library_paths.get(name)
+  if libpath is None:
+    if name:
+      libname = "liblammps_%s" % name + _LIB_EXT
+    else:
+      libname = "liblammps" + _LIB_EXT
+    libpath = join(_LIB_DIR,libname)
+    if not os.path.isfile(libpath):
+      return libname
+    _library_paths[name] = libpath
+  return libpath
+
+# -------------------------------------------------------------------------
+# optional CFFI support. when available, the most frequently called library
+# functions are called through a CFFI handle in ABI mode, which has less
+# per-call overhead than ctypes for converting the arguments.
+# the extract functions are only called through CFFI when they return
+# a pointer to a single double, so they are declared with that type.
+
+try:
+  from cffi import FFI as _FFI
+  _ffi = _FFI()
+  _ffi.cdef("""
+    char *lammps_command(void *handle, const char *cmd);
+    double lammps_get_thermo(void *handle, const char *keyword);
+    double *lammps_extract_compute(void *handle, char *id, int style, int type);
+    double *lammps_extract_fix(void *handle, char *id, int style, int type, int nrow, int ncol);
+    int lammps_extract_variable_scalar(void *handle, char *name, double *value);
+    void lammps_free(void *ptr);
+    void lammps_gather_atoms(void *handle, char *name, int type, int count, void *data);
+    void lammps_gather_atoms_concat(void *handle, char *name, int type, int count, void *data);
+    void lammps_gather(void *handle, char *name, int type, int count, void *data);
+    void lammps_gather_concat(void *handle, char *name, int type, int count, void *data);
+  """)
+except ImportError:
+  _ffi = None
+
+# size of the buffers for retrieving names of packages, styles, IDs, and
+# plugins from the library.  longer names are truncated by the library.
+
+_NAME_BUFFER_SIZE = 256
+
+# categories of styles and IDs that can be queried from the library
+
+_STYLE_CATEGORIES = ('atom', 'integrate', 'minimize', 'pair', 'bond', 'angle', 'dihedral',
+                     'improper', 'kspace', 'fix', 'compute', 'region', 'dump', 'command')
+_ID_CATEGORIES = ('compute', 'dump', 'fix', 'group', 'molecule', 'region', 'variable')
+
+# -------------------------------------------------------------------------
+# cache for strings encoded to bytes for passing to the library. Commands
+# and keywords are often repeated in a loop, so this avoids re-encoding
+# them on every call.  The cache is reset when it gets too large.
+# Arguments that are already bytes are passed through unchanged and
+# bytearray arguments are copied to bytes, since ctypes requires those.
+
+_ENCODE_CACHE_SIZE = 256
+_encode_cache = {}
+
+def _encode(s):
+  if isinstance(s, bytes):
+    return s
+  if isinstance(s, bytearray):
+    return bytes(s)
+  b = _encode_cache.get(s)
+  if b is None:
+    if len(_encode_cache) >= _ENCODE_CACHE_SIZE:
+      _encode_cache.clear()
+    b = _encode_cache[s] = s.encode()
+  return b
+
+# names are also used as keys of per-instance caches, which is not
+# possible for bytearray arguments. those are converted to bytes.
+
+def _key(s):
+  return bytes(s) if type(s) is bytearray else s
+
+# -------------------------------------------------------------------------
+# length of global properties that are vectors, indexed by name as string
+# or as bytes. all other properties except "respa_dt" are scalars.
+
+_GLOBAL_VECTOR_LENGTH = { 'boxlo':3, 'boxhi':3, 'sublo':3, 'subhi':3,
+                          'sublo_lambda':3, 'subhi_lambda':3, 'periodicity':3 }
+_GLOBAL_VECTOR_LENGTH.update([(k.encode(), v) for k, v in _GLOBAL_VECTOR_LENGTH.items()])
+
+# -------------------------------------------------------------------------
+# accelerator packages and their settings that are checked for
+# lammps.accelerator_config, together with the names encoded as bytes
+
+_ACCELERATOR_PACKAGES = [(p, p.encode()) for p in ('GPU', 'KOKKOS', 'USER-INTEL', 'USER-OMP')]
+_ACCELERATOR_CATEGORIES = [(c, c.encode(), [(s, s.encode()) for s in settings]) for c, settings in
+                           (('api', ('cuda', 'hip', 'phi', 'pthreads', 'opencl', 'openmp', 'serial')),
+                            ('precision', ('double', 'mixed', 'single')))]
+
+# -------------------------------------------------------------------------
+# argument and return types of library functions that are only used by
+# few scripts. those are declared when they are used for the first time
+# through lammps._libfunc() instead of when creating a lammps instance.
+
+_LAZY_PROTOTYPES = {
+  'lammps_get_os_info'           : ([c_char_p, c_int], None),
+  'lammps_get_mpi_comm'          : ([c_void_p], c_int),
+  'lammps_reset_box'             : ([c_void_p, POINTER(c_double), POINTER(c_double), c_double, c_double, c_double], None),
+  'lammps_is_running'            : ([c_void_p], c_int),
+  'lammps_force_timeout'         : ([c_void_p], None),
+  'lammps_finalize'              : ([], None),
+  'lammps_config_has_mpi_support': ([], c_int),
+  'lammps_config_has_exceptions' : ([], c_int),
+  'lammps_config_has_gzip_support': ([], c_int),
+  'lammps_config_has_png_support': ([], c_int),
+  'lammps_config_has_jpeg_support': ([], c_int),
+  'lammps_config_has_ffmpeg_support': ([], c_int),
+  'lammps_config_package_count'  : ([], c_int),
+  'lammps_config_package_name'   : ([c_int, c_char_p, c_int], c_int),
+  'lammps_config_accelerator'    : ([c_char_p, c_char_p, c_char_p], c_int),
+  'lammps_set_variable'          : ([c_void_p, c_char_p, c_char_p], c_int),
+  'lammps_has_style'             : ([c_void_p, c_char_p, c_char_p], c_int),
+  'lammps_style_count'           : ([c_void_p, c_char_p], c_int),
+  'lammps_style_name'            : ([c_void_p, c_char_p, c_int, c_char_p, c_int], c_int),
+  'lammps_style_names'           : ([c_void_p, c_char_p, c_char_p, c_int], c_int),
+  'lammps_has_id'                : ([c_void_p, c_char_p, c_char_p], c_int),
+  'lammps_id_count'              : ([c_void_p, c_char_p], c_int),
+  'lammps_id_name'               : ([c_void_p, c_char_p, c_int, c_char_p, c_int], c_int),
+  'lammps_id_names'              : ([c_void_p, c_char_p, c_char_p, c_int], c_int),
+  'lammps_plugin_count'          : ([], c_int),
+  'lammps_plugin_name'           : ([c_int, c_char_p, c_char_p, c_int], c_int),
+  'lammps_find_pair_neighlist'   : ([c_void_p, c_char_p, c_int, c_int, c_int], c_int),
+  'lammps_find_fix_neighlist'    : ([c_void_p, c_char_p, c_int], c_int),
+  'lammps_find_compute_neighlist': ([c_void_p, c_char_p, c_int], c_int),
+  'lammps_neighlist_elements'    : ([c_void_p, c_int, c_int, _P_INT, _P_INT, POINTER(_P_INT)], c_int),
+}
+
+# -------------------------------------------------------------------------
+# library functions for finding the neighbor lists of pair styles, fixes,
+# and computes. they are looked up through lammps._find_neighlist().
+
+_FIND_NEIGHLIST = {
+  'pair'    : 'lammps_find_pair_neighlist',
+  'fix'     : 'lammps_find_fix_neighlist',
+  'compute' : 'lammps_find_compute_neighlist',
+}
+
+# -------------------------------------------------------------------------
+# convert list of command line arguments into an array of C strings
+# with the executable name prepended. the list itself is not modified.
+
+def _command_line_args(cmdargs):
+  args = [b"lammps"] + [x.encode() if isinstance(x, str) else x for x in cmdargs]
+  return len(args), (c_char_p*len(args))(*args)
+
+# -------------------------------------------------------------------------
+# convert the first n elements of a sequence into a ctypes array for passing
+# to the library, or return None if that is not possible.  contiguous and
+# writable buffers (e.g. NumPy arrays) with the same data type are used
+# directly without copying the data.
+
+# size in bytes of a C-contiguous buffer, or -1 for other buffers.
+# memoryview.c_contiguous and memoryview.nbytes require Python 3.3.
+
+def _contiguous_nbytes(view):
+  shape = view.shape or ()
+  strides = view.strides
+  nbytes = view.itemsize
+  for i in reversed(range(len(shape))):
+    if strides is not None and shape[i] > 1 and strides[i] != nbytes: return -1
+    nbytes *= shape[i]
+  return nbytes
+
+_NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+_DOUBLE_FORMATS = set(p + 'd' for p in ('', '@', '=', _NATIVE_ORDER))
+_INT_FORMATS = set(p + c for p in ('', '@', '=', _NATIVE_ORDER) for c in 'ilq')
+
+def _as_c_array(ctype, data, n):
+  try:
+    view = memoryview(data)
+  except TypeError:
+    view = None
+  if view is not None and not view.readonly and view.itemsize == sizeof(ctype) \
+     and _contiguous_nbytes(view) >= n*view.itemsize \
+     and view.format in (_DOUBLE_FORMATS if ctype is c_double else _INT_FORMATS):
+    # Python 2 cannot create ctypes arrays from memoryviews
+    return (ctype*n).from_buffer(data)
+
+  try:
+    if len(data) < n: return None
+  except TypeError:
+    return None
+  arr = (ctype*n)()
+  try:
+    arr[:] = data[0:n]
+  except (TypeError, ValueError):
+    return None
+  return arr
+
+# -------------------------------------------------------------------------
+# replacement for a cache dictionary that never stores anything. it is used
+# when the cached data could be changed without the cache being cleared.
+
+class _NoCache(dict):
+  def __setitem__(self, key, value):
+    pass
+
 # -------------------------------------------------------------------------
 
 class MPIAbortException(Exception):
@@ -48,8 +338,7 @@ class ExceptionCheck:
     pass
 
   def __exit__(self, type, value, traceback):
-    if self.lmp.has_exceptions and self.lmp.lib.lammps_has_error(self.lmp.lmp):
-      raise self.lmp._lammps_exception
+    self.lmp._check_error()
 
 # -------------------------------------------------------------------------
 
@@ -87,14 +376,13 @@ class lammps(object):
     self.comm = comm
     self.opened = 0
 
-    # determine module file location
-
-    modpath = dirname(abspath(getsourcefile(lambda:0)))
-    # for windows installers the shared library is in a different folder
-    winpath = abspath(os.path.join(modpath,'..','..','bin'))
     self.lib = None
     self.lmp = None
 
+    # settings compiled into the library are looked up only once
+    self._config_flags = {}
+    self._accelerator_config = None
+
     # if a pointer to a LAMMPS object is handed in
     # when being called from a Python interpreter
     # embedded into a LAMMPS executable, all library
@@ -102,7 +390,7 @@ class lammps(object):
     # load a shared object.
 
     try:
-      if ptr: self.lib = CDLL("",RTLD_GLOBAL)
+      if ptr: self.lib = self._load_library("")
     except:
       self.lib = None
 
@@ -113,42 +401,13 @@ class lammps(object):
     #   so that LD_LIBRARY_PATH does not need to be set for regular install
     # fall back to loading with a relative path,
     #   typically requires LD_LIBRARY_PATH to be set appropriately
-    # guess shared library extension based on OS, if not inferred from actual file
-
-    if any([f.startswith('liblammps') and f.endswith('.dylib')
-            for f in os.listdir(modpath)]):
-      lib_ext = ".dylib"
-    elif any([f.startswith('liblammps') and f.endswith('.dll')
-              for f in os.listdir(modpath)]):
-      lib_ext = ".dll"
-    elif os.path.exists(winpath) and any([f.startswith('liblammps') and f.endswith('.dll')
-                  for f in os.listdir(winpath)]):
-      lib_ext = ".dll"
-      modpath = winpath
-    else:
-      import platform
-      if platform.system() == "Darwin":
-        lib_ext = ".dylib"
-      elif platform.system() == "Windows":
-        lib_ext = ".dll"
-      else:
-        lib_ext = ".so"
+    # the resulting path is determined only once for each name
 
     if not self.lib:
-      if name:
-        libpath = join(modpath,"liblammps_%s" % name + lib_ext)
-      else:
-        libpath = join(modpath,"liblammps" + lib_ext)
-      if not os.path.isfile(libpath):
-        if name:
-          libpath = "liblammps_%s" % name + lib_ext
-        else:
-          libpath = "liblammps" + lib_ext
-      self.lib = CDLL(libpath,RTLD_GLOBAL)
+      self.lib = self._load_library(_library_path(name))
 
-    # declare all argument and return types for all library methods here.
-    # exceptions are where the arguments depend on certain conditions and
-    # then are defined where the functions are used.
+    # the library handle is shared between instances, so argument and
+    # return types of library functions need to be declared only once.
     self.lib.lammps_extract_setting.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_extract_setting.restype = c_int
 
@@ -158,7 +417,180 @@ class lammps(object):
     self.c_tagint = get_ctypes_int(self.extract_setting("tagint"))
     self.c_imageint = get_ctypes_int(self.extract_setting("imageint"))
 
+    # the per-atom arrays are passed as plain addresses, so that ctypes does
+    # not have to create pointer objects for them on every callback
+    self.FIX_EXTERNAL_CALLBACK_FUNC = CFUNCTYPE(None, py_object, self.c_bigint, c_int, c_void_p, c_void_p, c_void_p)
+
+    if not getattr(self.lib, '_declared', False):
+      self._declare_prototypes()
+      self.lib._declared = True
+    self._has_error = self.lib.lammps_has_error
+    self._extract_atom_funcs = self.lib._lammps_extract_atom_funcs
+    self._extract_compute_funcs = self.lib._lammps_extract_compute_funcs
+    self._extract_fix_funcs = self.lib._lammps_extract_fix_funcs
+
+    # detect if Python is using a version of mpi4py that can pass communicators
+    # only needed if LAMMPS has been compiled with MPI support.
+    self.has_mpi4py = False
+    if self.has_mpi_support:
+      try:
+        from mpi4py import __version__ as mpi4py_version
+        # tested to work with mpi4py versions 2 and 3
+        self.has_mpi4py = mpi4py_version.split('.')[0] in ['2','3']
+      except:
+        pass
+
+    # if no ptr provided, create an instance of LAMMPS
+    #   don't know how to pass an MPI communicator from PyPar
+    #   but we can pass an MPI communicator from mpi4py v2.0.0 and later
+    #   no_mpi call lets LAMMPS use MPI_COMM_WORLD
+    #   cargs = array of C strings from args
+    # if ptr, then are embedding Python in LAMMPS input script
+    #   ptr is the desired instance of LAMMPS
+    #   just convert it to ctypes ptr and store in self.lmp
+
+    if not ptr:
+
+      # with mpi4py v2+, we can pass MPI communicators to LAMMPS
+      # need to adjust for type of MPI communicator object
+      # allow for int (like MPICH) or void* (like OpenMPI)
+      if self.has_mpi_support and self.has_mpi4py:
+        from mpi4py import MPI
+        self.MPI = MPI
+
+      if comm:
+        if not self.has_mpi_support:
+          raise Exception('LAMMPS not compiled with real MPI library')
+        if not self.has_mpi4py:
+          raise Exception('Python mpi4py version is not 2 or 3')
+        if self.MPI._sizeof(self.MPI.Comm) == sizeof(c_int):
+          MPI_Comm = c_int
+        else:
+          MPI_Comm = c_void_p
+
+        # Detect whether LAMMPS and mpi4py definitely use different MPI libs
+        if sizeof(MPI_Comm) != self._libfunc('lammps_config_has_mpi_support')():
+          raise Exception('Inconsistent MPI library in LAMMPS and mpi4py')
+
+        narg = 0
+        cargs = None
+        if cmdargs:
+          narg, cargs = _command_line_args(cmdargs)
+        self.lib.lammps_open.argtypes = [c_int, POINTER(c_char_p), \
+                                         MPI_Comm, c_void_p]
+
+        self.opened = 1
+        comm_ptr = self.MPI._addressof(comm)
+        comm_val = MPI_Comm.from_address(comm_ptr)
+        self.lmp = c_void_p(self.lib.lammps_open(narg,cargs,comm_val,None))
+
+      else:
+        if self.has_mpi4py and self.has_mpi_support:
+          self.comm = self.MPI.COMM_WORLD
+        self.opened = 1
+        if cmdargs:
+          narg, cargs = _command_line_args(cmdargs)
+          self.lmp = c_void_p(self.lib.lammps_open_no_mpi(narg,cargs,None))
+        else:
+          self.lmp = c_void_p(self.lib.lammps_open_no_mpi(0,None,None))
+
+    else:
+      # magic to convert ptr to ctypes ptr
+      if sys.version_info >= (3, 0):
+        # Python 3 (uses PyCapsule API)
+        pythonapi.PyCapsule_GetPointer.restype = c_void_p
+        pythonapi.PyCapsule_GetPointer.argtypes = [py_object, c_char_p]
+        self.lmp = c_void_p(pythonapi.PyCapsule_GetPointer(ptr, None))
+      else:
+        # Python 2 (uses PyCObject API)
+        pythonapi.PyCObject_AsVoidPtr.restype = c_void_p
+        pythonapi.PyCObject_AsVoidPtr.argtypes = [py_object]
+        self.lmp = c_void_p(pythonapi.PyCObject_AsVoidPtr(ptr))
+
+    # select once how to call the most frequently used library functions:
+    # through a CFFI handle to the same shared library and LAMMPS instance
+    # if available, or else through ctypes.
+    self._fast_lib = self.lib
+    self._fast_lmp = self.lmp
+    self._variable_value = (c_double*1)()
+    self._has_variable_scalar = hasattr(self.lib, 'lammps_extract_variable_scalar')
+    if _ffi:
+      try:
+        # the CFFI handle is shared like the ctypes library object
+        if self.lib._ffi_lib is None:
+          self.lib._ffi_lib = _ffi.dlopen(self.lib._name or None)
+        self._fast_lib, self._fast_lmp = self.lib._ffi_lib, \
+                                         _ffi.cast("void *", self.lmp.value or 0)
+        self._variable_value = _ffi.new("double *")
+      except Exception:
+        pass
+
+    # optional numpy support (lazy loading)
+    self._numpy = None
+
+    # cached lists of available styles, IDs, and plugins as well as neighbor
+    # list indices.  LAMMPS input may add or remove any of them, so the cache
+    # is cleared before processing input through the command(), commands_*(),
+    # and file() methods.  a LAMMPS instance passed in as ptr may also process
+    # input elsewhere (e.g. when Python is embedded in LAMMPS), so nothing is
+    # cached in that case.
+    self._available = _NoCache() if ptr else {}
+    self._global_datatypes = {}
+    self._global_accessors = {}
+    self._atom_datatypes = {}
+
+    # C++ exception support does not change, so check only once
+    self._has_exceptions = self.has_exceptions
+
+    # reusable buffer for retrieving error messages
+    self._error_buffer = create_string_buffer(512)
+
+    # reusable buffer for decoding image flags
+    self._image_flags = (c_int*3)()
+
+    # reusable atom index and neighbor count of neighbor list elements.
+    # the pointer to the neighbors is returned, so it is created per call.
+    self._neighlist_element = (c_int(), c_int())
+
+    # neighbor list functions are usually called once per element, so
+    # they are looked up in the shared library only once
+    self._neighlist_num_elements = self.lib.lammps_neighlist_num_elements
+    self._neighlist_element_neighbors = self.lib.lammps_neighlist_element_neighbors
+
+    # reusable buffers for retrieving package, style, id, and plugin names.
+    # plugins have a style and a name, so a second buffer is needed.
+    self._name_buffer = create_string_buffer(_NAME_BUFFER_SIZE)
+    self._name_buffer2 = create_string_buffer(_NAME_BUFFER_SIZE)
+
+    # check if liblammps version matches the installed python module version
+    # but not for in-place usage, i.e. when the version is 0
+    if _MODULE_VERSION > 0 and _MODULE_VERSION != self.lib.lammps_version(self.lmp):
+        raise(AttributeError("LAMMPS Python module installed for LAMMPS version %d, but shared library is version %d" \
+                % (_MODULE_VERSION, self.lib.lammps_version(self.lmp))))
+
+    # add way to insert Python callback for fix external
+    self.callback = {}
+
+  # -------------------------------------------------------------------------
+  # load shared library or return the handle of the already loaded library
+
+  _shared_libs = {}
+
+  @classmethod
+  def _load_library(cls, libpath):
+    lib = cls._shared_libs.get(libpath)
+    if lib is None:
+      lib = cls._shared_libs[libpath] = CDLL(libpath,RTLD_GLOBAL)
+    return lib
+
+  # -------------------------------------------------------------------------
+  # declare all argument and return types for all library methods here.
+  # exceptions are where the arguments depend on certain conditions and
+  # then are defined where the functions are used.
+
+  def _declare_prototypes(self):
     self.lib.lammps_open.restype = c_void_p
+    self.lib.lammps_open_no_mpi.argtypes = [c_int, POINTER(c_char_p), c_void_p]
     self.lib.lammps_open_no_mpi.restype = c_void_p
     self.lib.lammps_close.argtypes = [c_void_p]
     self.lib.lammps_free.argtypes = [c_void_p]
@@ -168,6 +600,7 @@ class lammps(object):
 
     self.lib.lammps_command.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_command.restype = c_char_p
+    self.lib.lammps_commands_list.argtypes = [c_void_p, c_int, POINTER(c_char_p)]
     self.lib.lammps_commands_list.restype = None
     self.lib.lammps_commands_string.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_commands_string.restype = None
@@ -180,10 +613,6 @@ class lammps(object):
        POINTER(c_int),POINTER(c_int)]
     self.lib.lammps_extract_box.restype = None
 
-    self.lib.lammps_reset_box.argtypes = \
-      [c_void_p,POINTER(c_double),POINTER(c_double),c_double,c_double,c_double]
-    self.lib.lammps_reset_box.restype = None
-
     self.lib.lammps_gather_atoms.argtypes = \
       [c_void_p,c_char_p,c_int,c_int,c_void_p]
     self.lib.lammps_gather_atoms.restype = None
@@ -224,27 +653,12 @@ class lammps(object):
       [c_void_p,c_char_p,c_int,c_int,c_int,POINTER(c_int),c_void_p]
     self.lib.lammps_scatter_subset.restype = None
 
-
-    self.lib.lammps_find_pair_neighlist.argtypes = [c_void_p, c_char_p, c_int, c_int, c_int]
-    self.lib.lammps_find_pair_neighlist.restype  = c_int
-
-    self.lib.lammps_find_fix_neighlist.argtypes = [c_void_p, c_char_p, c_int]
-    self.lib.lammps_find_fix_neighlist.restype  = c_int
-
-    self.lib.lammps_find_compute_neighlist.argtypes = [c_void_p, c_char_p, c_int]
-    self.lib.lammps_find_compute_neighlist.restype  = c_int
-
     self.lib.lammps_neighlist_num_elements.argtypes = [c_void_p, c_int]
     self.lib.lammps_neighlist_num_elements.restype  = c_int
 
     self.lib.lammps_neighlist_element_neighbors.argtypes = [c_void_p, c_int, c_int, POINTER(c_int), POINTER(c_int), POINTER(POINTER(c_int))]
     self.lib.lammps_neighlist_element_neighbors.restype  = None
 
-    self.lib.lammps_is_running.argtypes = [c_void_p]
-    self.lib.lammps_is_running.restype = c_int
-
-    self.lib.lammps_force_timeout.argtypes = [c_void_p]
-
     self.lib.lammps_has_error.argtypes = [c_void_p]
     self.lib.lammps_has_error.restype = c_int
 
@@ -254,165 +668,64 @@ class lammps(object):
     self.lib.lammps_extract_global.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_extract_global_datatype.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_extract_global_datatype.restype = c_int
-    self.lib.lammps_extract_compute.argtypes = [c_void_p, c_char_p, c_int, c_int]
+    self._declare_typed_functions('lammps_extract_compute', [c_void_p, c_char_p, c_int, c_int],
+                                  [_P_DOUBLE, _P_INT, _PP_DOUBLE])
 
     self.lib.lammps_get_thermo.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_get_thermo.restype = c_double
 
     self.lib.lammps_encode_image_flags.restype = self.c_imageint
 
-    self.lib.lammps_config_package_name.argtypes = [c_int, c_char_p, c_int]
-    self.lib.lammps_config_accelerator.argtypes = [c_char_p, c_char_p, c_char_p]
-
-    self.lib.lammps_set_variable.argtypes = [c_void_p, c_char_p, c_char_p]
-
-    self.lib.lammps_has_style.argtypes = [c_void_p, c_char_p, c_char_p]
-
-    self.lib.lammps_style_count.argtypes = [c_void_p, c_char_p]
-
-    self.lib.lammps_style_name.argtypes = [c_void_p, c_char_p, c_int, c_char_p, c_int]
-
-    self.lib.lammps_has_id.argtypes = [c_void_p, c_char_p, c_char_p]
-
-    self.lib.lammps_id_count.argtypes = [c_void_p, c_char_p]
-
-    self.lib.lammps_id_name.argtypes = [c_void_p, c_char_p, c_int, c_char_p, c_int]
-
-    self.lib.lammps_plugin_count.argtypes = [ ]
-    self.lib.lammps_plugin_name.argtypes = [c_int, c_char_p, c_char_p, c_int]
-
     self.lib.lammps_version.argtypes = [c_void_p]
 
-    self.lib.lammps_get_os_info.argtypes = [c_char_p, c_int]
-
-    self.lib.lammps_get_mpi_comm.argtypes = [c_void_p]
-
     self.lib.lammps_decode_image_flags.argtypes = [self.c_imageint, POINTER(c_int*3)]
 
-    self.lib.lammps_extract_atom.argtypes = [c_void_p, c_char_p]
+    self._declare_typed_functions('lammps_extract_atom', [c_void_p, c_char_p],
+                                  [_P_DOUBLE, _PP_DOUBLE,
+                                   _P_INT32, _PP_INT32,
+                                   _P_INT64, _PP_INT64])
     self.lib.lammps_extract_atom_datatype.argtypes = [c_void_p, c_char_p]
     self.lib.lammps_extract_atom_datatype.restype = c_int
 
-    self.lib.lammps_extract_fix.argtypes = [c_void_p, c_char_p, c_int, c_int, c_int, c_int]
+    self._declare_typed_functions('lammps_extract_fix', [c_void_p, c_char_p, c_int, c_int, c_int, c_int],
+                                  [_P_DOUBLE, _P_INT, _PP_DOUBLE])
 
     self.lib.lammps_extract_variable.argtypes = [c_void_p, c_char_p, c_char_p]
+    self.lib.lammps_extract_variable.restype = _P_DOUBLE
+    if hasattr(self.lib, 'lammps_extract_variable_scalar'):
+      self.lib.lammps_extract_variable_scalar.argtypes = [c_void_p, c_char_p, _P_DOUBLE]
+      self.lib.lammps_extract_variable_scalar.restype = c_int
 
-    # TODO: NOT IMPLEMENTED IN PYTHON WRAPPER
-    self.lib.lammps_fix_external_set_energy_global = [c_void_p, c_char_p, c_double]
-    self.lib.lammps_fix_external_set_virial_global = [c_void_p, c_char_p, POINTER(c_double)]
-
-    # detect if Python is using a version of mpi4py that can pass communicators
-    # only needed if LAMMPS has been compiled with MPI support.
-    self.has_mpi4py = False
-    if self.has_mpi_support:
-      try:
-        from mpi4py import __version__ as mpi4py_version
-        # tested to work with mpi4py versions 2 and 3
-        self.has_mpi4py = mpi4py_version.split('.')[0] in ['2','3']
-      except:
-        pass
-
-    # if no ptr provided, create an instance of LAMMPS
-    #   don't know how to pass an MPI communicator from PyPar
-    #   but we can pass an MPI communicator from mpi4py v2.0.0 and later
-    #   no_mpi call lets LAMMPS use MPI_COMM_WORLD
-    #   cargs = array of C strings from args
-    # if ptr, then are embedding Python in LAMMPS input script
-    #   ptr is the desired instance of LAMMPS
-    #   just convert it to ctypes ptr and store in self.lmp
-
-    if not ptr:
+    self.lib.lammps_create_atoms.argtypes = [c_void_p, c_int, POINTER(self.c_tagint),
+                                             _P_INT, _P_DOUBLE,
+                                             _P_DOUBLE,
+                                             POINTER(self.c_imageint), c_int]
+    self.lib.lammps_create_atoms.restype = c_int
 
-      # with mpi4py v2+, we can pass MPI communicators to LAMMPS
-      # need to adjust for type of MPI communicator object
-      # allow for int (like MPICH) or void* (like OpenMPI)
-      if self.has_mpi_support and self.has_mpi4py:
-        from mpi4py import MPI
-        self.MPI = MPI
-
-      if comm:
-        if not self.has_mpi_support:
-          raise Exception('LAMMPS not compiled with real MPI library')
-        if not self.has_mpi4py:
-          raise Exception('Python mpi4py version is not 2 or 3')
-        if self.MPI._sizeof(self.MPI.Comm) == sizeof(c_int):
-          MPI_Comm = c_int
-        else:
-          MPI_Comm = c_void_p
-
-        # Detect whether LAMMPS and mpi4py definitely use different MPI libs
-        if sizeof(MPI_Comm) != self.lib.lammps_config_has_mpi_support():
-          raise Exception('Inconsistent MPI library in LAMMPS and mpi4py')
-
-        narg = 0
-        cargs = None
-        if cmdargs:
-          cmdargs.insert(0,"lammps")
-          narg = len(cmdargs)
-          for i in range(narg):
-            if type(cmdargs[i]) is str:
-              cmdargs[i] = cmdargs[i].encode()
-          cargs = (c_char_p*narg)(*cmdargs)
-          self.lib.lammps_open.argtypes = [c_int, c_char_p*narg, \
-                                           MPI_Comm, c_void_p]
-        else:
-          self.lib.lammps_open.argtypes = [c_int, c_char_p, \
-                                           MPI_Comm, c_void_p]
-
-        self.opened = 1
-        comm_ptr = self.MPI._addressof(comm)
-        comm_val = MPI_Comm.from_address(comm_ptr)
-        self.lmp = c_void_p(self.lib.lammps_open(narg,cargs,comm_val,None))
-
-      else:
-        if self.has_mpi4py and self.has_mpi_support:
-          self.comm = self.MPI.COMM_WORLD
-        self.opened = 1
-        if cmdargs:
-          cmdargs.insert(0,"lammps")
-          narg = len(cmdargs)
-          for i in range(narg):
-            if type(cmdargs[i]) is str:
-              cmdargs[i] = cmdargs[i].encode()
-          cargs = (c_char_p*narg)(*cmdargs)
-          self.lib.lammps_open_no_mpi.argtypes = [c_int, c_char_p*narg, \
-                                                  c_void_p]
-          self.lmp = c_void_p(self.lib.lammps_open_no_mpi(narg,cargs,None))
-        else:
-          self.lib.lammps_open_no_mpi.argtypes = [c_int, c_char_p, c_void_p]
-          self.lmp = c_void_p(self.lib.lammps_open_no_mpi(0,None,None))
-
-    else:
-      # magic to convert ptr to ctypes ptr
-      if sys.version_info >= (3, 0):
-        # Python 3 (uses PyCapsule API)
-        pythonapi.PyCapsule_GetPointer.restype = c_void_p
-        pythonapi.PyCapsule_GetPointer.argtypes = [py_object, c_char_p]
-        self.lmp = c_void_p(pythonapi.PyCapsule_GetPointer(ptr, None))
-      else:
-        # Python 2 (uses PyCObject API)
-        pythonapi.PyCObject_AsVoidPtr.restype = c_void_p
-        pythonapi.PyCObject_AsVoidPtr.argtypes = [py_object]
-        self.lmp = c_void_p(pythonapi.PyCObject_AsVoidPtr(ptr))
+    self.lib.lammps_set_fix_external_callback.argtypes = [c_void_p, c_char_p, self.FIX_EXTERNAL_CALLBACK_FUNC, py_object]
+    self.lib.lammps_set_fix_external_callback.restype = None
 
-    # optional numpy support (lazy loading)
-    self._numpy = None
+    # the list of packages is compiled into the library and thus shared
+    self.lib._installed_packages = None
 
-    self._installed_packages = None
-    self._available_styles = None
+    # CFFI handle to the same library, which is opened on first use
+    self.lib._ffi_lib = None
 
-    # check if liblammps version matches the installed python module version
-    # but not for in-place usage, i.e. when the version is 0
-    import lammps
-    if lammps.__version__ > 0 and lammps.__version__ != self.lib.lammps_version(self.lmp):
-        raise(AttributeError("LAMMPS Python module installed for LAMMPS version %d, but shared library is version %d" \
-                % (lammps.__version__, self.lib.lammps_version(self.lmp))))
-
-    # add way to insert Python callback for fix external
-    self.callback = {}
-    self.FIX_EXTERNAL_CALLBACK_FUNC = CFUNCTYPE(None, py_object, self.c_bigint, c_int, POINTER(self.c_tagint), POINTER(POINTER(c_double)), POINTER(POINTER(c_double)))
-    self.lib.lammps_set_fix_external_callback.argtypes = [c_void_p, c_char_p, self.FIX_EXTERNAL_CALLBACK_FUNC, py_object]
-    self.lib.lammps_set_fix_external_callback.restype = None
+  # -------------------------------------------------------------------------
+  # the extract functions return pointers to different types of data.
+  # one function object is declared for each return type, so that the
+  # return type does not need to be changed before every call.  the first
+  # return type is used for the default function object of the library.
+
+  def _declare_typed_functions(self, name, argtypes, restypes):
+    funcs = {}
+    for restype in restypes:
+      if funcs: func = self.lib[name]
+      else: func = getattr(self.lib, name)
+      func.argtypes = argtypes
+      func.restype = restype
+      funcs[restype] = func
+    setattr(self.lib, '_' + name + '_funcs', funcs)
 
   # -------------------------------------------------------------------------
   # shut-down LAMMPS instance
@@ -422,6 +735,16 @@ class lammps(object):
       self.lib.lammps_close(self.lmp)
       self.opened = 0
 
+  # -------------------------------------------------------------------------
+  # return library function and declare its prototype on first use
+
+  def _libfunc(self, name):
+    func = getattr(self.lib, name)
+    if not getattr(func, '_declared', False):
+      func.argtypes, func.restype = _LAZY_PROTOTYPES[name]
+      func._declared = True
+    return func
+
   # -------------------------------------------------------------------------
 
   @property
@@ -449,6 +772,7 @@ class lammps(object):
     """
     if self.opened: self.lib.lammps_close(self.lmp)
     self.lmp = None
+    self._fast_lmp = None
     self.opened = 0
 
   # -------------------------------------------------------------------------
@@ -458,8 +782,9 @@ class lammps(object):
     """
     if self.opened: self.lib.lammps_close(self.lmp)
     self.lmp = None
+    self._fast_lmp = None
     self.opened = 0
-    self.lib.lammps_finalize()
+    self._libfunc('lammps_finalize')()
 
   # -------------------------------------------------------------------------
 
@@ -485,7 +810,7 @@ class lammps(object):
     """
 
     sb = create_string_buffer(512)
-    self.lib.lammps_get_os_info(sb,512)
+    self._libfunc('lammps_get_os_info')(sb,512)
     return sb
 
   # -------------------------------------------------------------------------
@@ -504,7 +829,7 @@ class lammps(object):
 
     if self.has_mpi4py and self.has_mpi_support:
         from mpi4py import MPI
-        f_comm = self.lib.lammps_get_mpi_comm(self.lmp)
+        f_comm = self._libfunc('lammps_get_mpi_comm')(self.lmp)
         c_comm = MPI.Comm.f2py(f_comm)
         return c_comm
     else:
@@ -514,14 +839,23 @@ class lammps(object):
 
   @property
   def _lammps_exception(self):
-    sb = create_string_buffer(100)
-    error_type = self.lib.lammps_get_last_error_message(self.lmp, sb, 100)
+    sb = self._error_buffer
+    error_type = self.lib.lammps_get_last_error_message(self.lmp, sb, len(sb))
     error_msg = sb.value.decode().strip()
 
     if error_type == 2:
       return MPIAbortException(error_msg)
     return Exception(error_msg)
 
+  # -------------------------------------------------------------------------
+  # rethrow a pending LAMMPS C++ exception as Python exception.
+  # this is called directly after library calls on frequently used
+  # code paths instead of using the ExceptionCheck context manager.
+
+  def _check_error(self):
+    if self._has_exceptions and self._has_error(self.lmp):
+      raise self._lammps_exception
+
   # -------------------------------------------------------------------------
 
   def file(self, path):
@@ -532,13 +866,14 @@ class lammps(object):
     the end. The function will return when the end of the file is reached.
 
     :param path: Name of the file/path with LAMMPS commands
-    :type path:  string
+    :type path:  string or bytes
     """
-    if path: path = path.encode()
+    if path: path = _encode(path)
     else: return
 
-    with ExceptionCheck(self):
-      self.lib.lammps_file(self.lmp, path)
+    if self._available: self._available.clear()
+    self.lib.lammps_file(self.lmp, path)
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
@@ -546,36 +881,48 @@ class lammps(object):
     """Process a single LAMMPS input command from a string.
 
     This is a wrapper around the :cpp:func:`lammps_command`
-    function of the C-library interface.
+    function of the C-library interface.  The command may also be
+    given as bytes, which are passed to the library without encoding.
+    This can be used to avoid the conversion when the same command
+    is issued many times in a loop.
 
     :param cmd: a single lammps command
-    :type cmd:  string
+    :type cmd:  string or bytes
     """
-    if cmd: cmd = cmd.encode()
+    if cmd: cmd = _encode(cmd)
     else: return
 
-    with ExceptionCheck(self):
-      self.lib.lammps_command(self.lmp,cmd)
+    if self._available: self._available.clear()
+    self._fast_lib.lammps_command(self._fast_lmp,cmd)
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
   def commands_list(self,cmdlist):
     """Process multiple LAMMPS input commands from a list of strings.
 
-    This is a wrapper around the
-    :cpp:func:`lammps_commands_list` function of
-    the C-library interface.
+    This is equivalent to the :cpp:func:`lammps_commands_list`
+    function of the C-library interface, which joins the commands
+    with newline characters and processes the result with
+    :cpp:func:`lammps_commands_string`.  Here the commands are joined
+    in Python and passed in a single call, so that no array of C
+    strings needs to be assembled.
 
-    :param cmdlist: a single lammps command
-    :type cmdlist:  list of strings
+    :param cmdlist: list of lammps commands
+    :type cmdlist:  list of strings or bytes
+    :raises TypeError: if an entry is neither a string nor bytes
     """
-    cmds = [x.encode() for x in cmdlist if type(x) is str]
-    narg = len(cmdlist)
-    args = (c_char_p * narg)(*cmds)
-    self.lib.lammps_commands_list.argtypes = [c_void_p, c_int, c_char_p * narg]
+    try:
+      cmds = b"\n".join([_encode(x) for x in cmdlist])
+    except (AttributeError, TypeError):
+      for x in cmdlist:
+        if not isinstance(x, (bytes, bytearray)) and not hasattr(x, 'encode'):
+          raise TypeError("LAMMPS command must be a string or bytes, not %r" % (x,))
+      raise
 
-    with ExceptionCheck(self):
-      self.lib.lammps_commands_list(self.lmp,narg,args)
+    if self._available: self._available.clear()
+    self.lib.lammps_commands_string(self.lmp,cmds)
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
@@ -587,12 +934,14 @@ class lammps(object):
     function of the C-library interface.
 
     :param multicmd: text block of lammps commands
-    :type multicmd:  string
+    :type multicmd:  string or bytes
     """
     if type(multicmd) is str: multicmd = multicmd.encode()
+    elif type(multicmd) is bytearray: multicmd = bytes(multicmd)
 
-    with ExceptionCheck(self):
-      self.lib.lammps_commands_string(self.lmp,c_char_p(multicmd))
+    if self._available: self._available.clear()
+    self.lib.lammps_commands_string(self.lmp,c_char_p(multicmd))
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
@@ -627,10 +976,11 @@ class lammps(object):
     periodicity = (3*c_int)()
     box_change = c_int()
 
-    with ExceptionCheck(self):
-      self.lib.lammps_extract_box(self.lmp,boxlo,boxhi,
-                                  byref(xy),byref(yz),byref(xz),
-                                  periodicity,byref(box_change))
+    # ctypes passes xy, yz, xz, and box_change by reference since
+    # the corresponding arguments are declared as pointers
+    self.lib.lammps_extract_box(self.lmp,boxlo,boxhi,xy,yz,xz,
+                                periodicity,box_change)
+    self._check_error()
 
     boxlo = boxlo[:3]
     boxhi = boxhi[:3]
@@ -663,8 +1013,8 @@ class lammps(object):
     """
     cboxlo = (3*c_double)(*boxlo)
     cboxhi = (3*c_double)(*boxhi)
-    with ExceptionCheck(self):
-      self.lib.lammps_reset_box(self.lmp,cboxlo,cboxhi,xy,yz,xz)
+    self._libfunc('lammps_reset_box')(self.lmp,cboxlo,cboxhi,xy,yz,xz)
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
@@ -675,15 +1025,16 @@ class lammps(object):
     function of the C-library interface.
 
     :param name: name of thermo keyword
-    :type name: string
+    :type name: string or bytes
     :return: value of thermo keyword
     :rtype: double or None
     """
-    if name: name = name.encode()
+    if name: name = _encode(name)
     else: return None
 
-    with ExceptionCheck(self):
-      return self.lib.lammps_get_thermo(self.lmp,name)
+    value = self._fast_lib.lammps_get_thermo(self._fast_lmp,name)
+    self._check_error()
+    return value
 
   # -------------------------------------------------------------------------
 
@@ -695,11 +1046,11 @@ class lammps(object):
     a list of the supported keywords.
 
     :param name: name of the setting
-    :type name:  string
+    :type name:  string or bytes
     :return: value of the setting
     :rtype: int
     """
-    if name: name = name.encode()
+    if name: name = _encode(name)
     else: return None
     return int(self.lib.lammps_extract_setting(self.lmp,name))
 
@@ -718,13 +1069,19 @@ class lammps(object):
     constants define in the :py:mod:`lammps` module.
 
     :param name: name of the property
-    :type name:  string
+    :type name:  string or bytes
     :return: data type of global property, see :ref:`py_datatype_constants`
     :rtype: int
     """
-    if name: name = name.encode()
-    else: return None
-    return self.lib.lammps_extract_global_datatype(self.lmp, name)
+    if not name: return None
+
+    # the data type only depends on the name, so it needs to be looked up only once
+    name = _key(name)
+    dtype = self._global_datatypes.get(name)
+    if dtype is None:
+      dtype = self.lib.lammps_extract_global_datatype(self.lmp, _encode(name))
+      self._global_datatypes[name] = dtype
+    return dtype
 
   # -------------------------------------------------------------------------
   # extract global info
@@ -745,52 +1102,82 @@ class lammps(object):
     or an invalid data type constant is used.
 
     :param name: name of the property
-    :type name:  string
+    :type name:  string or bytes
     :param dtype: data type of the returned data (see :ref:`py_datatype_constants`)
     :type dtype:  int, optional
     :return: value of the property or list of values or None
     :rtype: int, float, list, or NoneType
     """
 
-    if dtype == LAMMPS_AUTODETECT:
-      dtype = self.extract_global_datatype(name)
+    if not name: return None
 
-    # set length of vector for items that are not a scalar
-    vec_dict = { 'boxlo':3, 'boxhi':3, 'sublo':3, 'subhi':3,
-                 'sublo_lambda':3, 'subhi_lambda':3, 'periodicity':3 }
-    if name in vec_dict:
-      veclen = vec_dict[name]
-    elif name == 'respa_dt':
-      veclen = self.extract_global('respa_levels',LAMMPS_INT)
-    else:
-      veclen = 1
+    # the data type and length of a property depend only on its name,
+    # so the accessor for it is created on first use and then reused
+    name = _key(name)
+    key = (name, dtype)
+    get = self._global_accessors.get(key)
+    if get is None:
+      get = self._global_accessors[key] = self._global_accessor(name, dtype)
+    return get(self)
 
-    if name: name = name.encode()
-    else: return None
+  # -------------------------------------------------------------------------
+  # create function that extracts a global property with a given name and type.
+  # each accessor calls its own library function object with the matching
+  # return type, so that the return type does not change between calls.
+
+  def _global_accessor(self, name, dtype):
+    if dtype == LAMMPS_AUTODETECT:
+      dtype = self.extract_global_datatype(name)
 
     if dtype == LAMMPS_INT:
-      self.lib.lammps_extract_global.restype = POINTER(c_int32)
+      restype = _P_INT32
       target_type = int
     elif dtype == LAMMPS_INT64:
-      self.lib.lammps_extract_global.restype = POINTER(c_int64)
+      restype = _P_INT64
       target_type = int
     elif dtype == LAMMPS_DOUBLE:
-      self.lib.lammps_extract_global.restype = POINTER(c_double)
+      restype = _P_DOUBLE
       target_type = float
     elif dtype == LAMMPS_STRING:
-      self.lib.lammps_extract_global.restype = c_char_p
-
-    ptr = self.lib.lammps_extract_global(self.lmp, name)
-    if ptr:
-      if dtype == LAMMPS_STRING:
-        return ptr.decode('utf-8')
-      if veclen > 1:
-        result = []
-        for i in range(0,veclen):
-          result.append(target_type(ptr[i]))
-        return result
-      else: return target_type(ptr[0])
-    return None
+      restype = c_char_p
+    else:
+      return lambda lmp: None
+
+    func = self.lib['lammps_extract_global']
+    func.argtypes = [c_void_p, c_char_p]
+    func.restype = restype
+    cname = _encode(name)
+
+    if dtype == LAMMPS_STRING:
+      def get(lmp):
+        ptr = func(lmp.lmp, cname)
+        if ptr: return ptr.decode('utf-8')
+        return None
+
+    # the length of the "respa_dt" vector depends on the current run style
+    elif name in ('respa_dt', b'respa_dt'):
+      def get(lmp):
+        ptr = func(lmp.lmp, cname)
+        if ptr:
+          veclen = lmp.extract_global('respa_levels',LAMMPS_INT)
+          if veclen > 1: return ptr[:veclen]
+          return target_type(ptr[0])
+        return None
+
+    elif name in _GLOBAL_VECTOR_LENGTH:
+      veclen = _GLOBAL_VECTOR_LENGTH[name]
+      def get(lmp):
+        ptr = func(lmp.lmp, cname)
+        if ptr: return ptr[:veclen]
+        return None
+
+    else:
+      def get(lmp):
+        ptr = func(lmp.lmp, cname)
+        if ptr: return target_type(ptr[0])
+        return None
+
+    return get
 
   # -------------------------------------------------------------------------
   # extract per-atom info datatype
@@ -807,13 +1194,19 @@ class lammps(object):
     defined in the :py:mod:`lammps` module.
 
     :param name: name of the property
-    :type name:  string
+    :type name:  string or bytes
     :return: data type of per-atom property (see :ref:`py_datatype_constants`)
     :rtype: int
     """
-    if name: name = name.encode()
-    else: return None
-    return self.lib.lammps_extract_atom_datatype(self.lmp, name)
+    if not name: return None
+
+    # the data type only depends on the name, so it needs to be looked up only once
+    name = _key(name)
+    dtype = self._atom_datatypes.get(name)
+    if dtype is None:
+      dtype = self.lib.lammps_extract_atom_datatype(self.lmp, _encode(name))
+      self._atom_datatypes[name] = dtype
+    return dtype
 
   # -------------------------------------------------------------------------
   # extract per-atom info
@@ -842,7 +1235,7 @@ class lammps(object):
        for example :doc:`comm_modify vel yes <comm_modify>`.
 
     :param name: name of the property
-    :type name:  string
+    :type name:  string or bytes
     :param dtype: data type of the returned data (see :ref:`py_datatype_constants`)
     :type dtype:  int, optional
     :return: requested data or ``None``
@@ -854,24 +1247,13 @@ class lammps(object):
     if dtype == LAMMPS_AUTODETECT:
       dtype = self.extract_atom_datatype(name)
 
-    if name: name = name.encode()
+    if name: name = _encode(name)
     else: return None
 
-    if dtype == LAMMPS_INT:
-      self.lib.lammps_extract_atom.restype = POINTER(c_int32)
-    elif dtype == LAMMPS_INT_2D:
-      self.lib.lammps_extract_atom.restype = POINTER(POINTER(c_int32))
-    elif dtype == LAMMPS_DOUBLE:
-      self.lib.lammps_extract_atom.restype = POINTER(c_double)
-    elif dtype == LAMMPS_DOUBLE_2D:
-      self.lib.lammps_extract_atom.restype = POINTER(POINTER(c_double))
-    elif dtype == LAMMPS_INT64:
-      self.lib.lammps_extract_atom.restype = POINTER(c_int64)
-    elif dtype == LAMMPS_INT64_2D:
-      self.lib.lammps_extract_atom.restype = POINTER(POINTER(c_int64))
-    else: return None
+    restype = _EXTRACT_ATOM_RESTYPES.get(dtype)
+    if restype is None: return None
 
-    ptr = self.lib.lammps_extract_atom(self.lmp, name)
+    ptr = self._extract_atom_funcs[restype](self.lmp, name)
     if ptr: return ptr
     else:   return None
 
@@ -899,53 +1281,23 @@ class lammps(object):
     :return: requested data as scalar, pointer to 1d or 2d double array, or None
     :rtype: c_double, ctypes.POINTER(c_double), ctypes.POINTER(ctypes.POINTER(c_double)), or NoneType
     """
-    if id: id = id.encode()
+    if id: id = _encode(id)
     else: return None
 
-    if type == LMP_TYPE_SCALAR:
-      if style == LMP_STYLE_GLOBAL:
-        self.lib.lammps_extract_compute.restype = POINTER(c_double)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-        return ptr[0]
-      elif style == LMP_STYLE_ATOM:
-        return None
-      elif style == LMP_STYLE_LOCAL:
-        self.lib.lammps_extract_compute.restype = POINTER(c_int)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-        return ptr[0]
-
-    elif type == LMP_TYPE_VECTOR:
-      self.lib.lammps_extract_compute.restype = POINTER(c_double)
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-      return ptr
-
-    elif type == LMP_TYPE_ARRAY:
-      self.lib.lammps_extract_compute.restype = POINTER(POINTER(c_double))
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-      return ptr
-
-    elif type == LMP_SIZE_COLS:
-      if style == LMP_STYLE_GLOBAL  \
-         or style == LMP_STYLE_ATOM \
-         or style == LMP_STYLE_LOCAL:
-        self.lib.lammps_extract_compute.restype = POINTER(c_int)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-        return ptr[0]
+    entry = _EXTRACT_COMPUTE.get((style,type))
+    if entry is None: return None
+    restype, value = entry
 
-    elif type == LMP_SIZE_VECTOR or type == LMP_SIZE_ROWS:
-      if style == LMP_STYLE_GLOBAL  \
-         or style == LMP_STYLE_LOCAL:
-        self.lib.lammps_extract_compute.restype = POINTER(c_int)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_compute(self.lmp,id,style,type)
-        return ptr[0]
+    if restype is None:
+      ptr = self._fast_lib.lammps_extract_compute(self._fast_lmp,id,style,type)
+      self._check_error()
+      if ptr: return ptr[0]
+      return None
 
-    return None
+    ptr = self._extract_compute_funcs[restype](self.lmp,id,style,type)
+    self._check_error()
+    if value: return ptr[0]
+    return ptr
 
   # -------------------------------------------------------------------------
   # extract fix info
@@ -979,70 +1331,39 @@ class lammps(object):
     :rtype: c_double, ctypes.POINTER(c_double), ctypes.POINTER(ctypes.POINTER(c_double)), or NoneType
 
     """
-    if id: id = id.encode()
+    if id: id = _encode(id)
     else: return None
 
-    if style == LMP_STYLE_GLOBAL:
-      if type in (LMP_TYPE_SCALAR, LMP_TYPE_VECTOR, LMP_TYPE_ARRAY):
-        self.lib.lammps_extract_fix.restype = POINTER(c_double)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_fix(self.lmp,id,style,type,nrow,ncol)
-        result = ptr[0]
-        self.lib.lammps_free(ptr)
-        return result
-      elif type in (LMP_SIZE_VECTOR, LMP_SIZE_ROWS, LMP_SIZE_COLS):
-        self.lib.lammps_extract_fix.restype = POINTER(c_int)
-        with ExceptionCheck(self):
-          ptr = self.lib.lammps_extract_fix(self.lmp,id,style,type,nrow,ncol)
-        return ptr[0]
-      else:
-        return None
+    entry = _EXTRACT_FIX.get((style,type))
+    if entry is None: return None
+    restype, value = entry
 
-    elif style == LMP_STYLE_ATOM:
-      if type == LMP_TYPE_VECTOR:
-        self.lib.lammps_extract_fix.restype = POINTER(c_double)
-      elif type == LMP_TYPE_ARRAY:
-        self.lib.lammps_extract_fix.restype = POINTER(POINTER(c_double))
-      elif type == LMP_SIZE_COLS:
-        self.lib.lammps_extract_fix.restype = POINTER(c_int)
-      else:
-        return None
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_fix(self.lmp,id,style,type,nrow,ncol)
-      if type == LMP_SIZE_COLS:
-        return ptr[0]
-      else:
-        return ptr
-
-    elif style == LMP_STYLE_LOCAL:
-      if type == LMP_TYPE_VECTOR:
-        self.lib.lammps_extract_fix.restype = POINTER(c_double)
-      elif type == LMP_TYPE_ARRAY:
-        self.lib.lammps_extract_fix.restype = POINTER(POINTER(c_double))
-      elif type in (LMP_TYPE_SCALAR, LMP_SIZE_VECTOR, LMP_SIZE_ROWS, LMP_SIZE_COLS):
-        self.lib.lammps_extract_fix.restype = POINTER(c_int)
-      else:
-        return None
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_fix(self.lmp,id,style,type,nrow,ncol)
-      if type in (LMP_TYPE_VECTOR, LMP_TYPE_ARRAY):
-        return ptr
-      else:
-        return ptr[0]
-    else:
-      return None
+    if restype is None:
+      ptr = self._fast_lib.lammps_extract_fix(self._fast_lmp,id,style,type,nrow,ncol)
+      self._check_error()
+      if not ptr: return None
+      result = ptr[0]
+      self._fast_lib.lammps_free(ptr)
+      return result
+
+    ptr = self._extract_fix_funcs[restype](self.lmp,id,style,type,nrow,ncol)
+    self._check_error()
+    if value: return ptr[0]
+    return ptr
 
   # -------------------------------------------------------------------------
   # extract variable info
   # free memory for 1 double or 1 vector of doubles via lammps_free()
   # for vector, must copy nlocal returned values to local c_double vector
+  # in a single memmove()
   # memory was allocated by library interface function
 
   def extract_variable(self, name, group=None, vartype=LMP_VAR_EQUAL):
     """ Evaluate a LAMMPS variable and return its data
 
-    This function is a wrapper around the function
-    :cpp:func:`lammps_extract_variable` of the C-library interface,
+    This function is a wrapper around the functions
+    :cpp:func:`lammps_extract_variable` and
+    :cpp:func:`lammps_extract_variable_scalar` of the C-library interface,
     evaluates variable name and returns a copy of the computed data.
     The memory temporarily allocated by the C-interface is deleted
     after the data is copied to a Python variable or list.
@@ -1050,7 +1371,8 @@ class lammps(object):
     variable or an atom-style variable. The variable type has to
     provided as ``vartype`` parameter which may be one of two constants:
     ``LMP_VAR_EQUAL`` or ``LMP_VAR_ATOM``; it defaults to
-    equal-style variables.
+    equal-style variables.  Requesting an atom-style variable as
+    equal-style returns the value of its first local atom.
     The group parameter is only used for atom-style variables and
     defaults to the group "all" if set to ``None``, which is the default.
 
@@ -1063,25 +1385,31 @@ class lammps(object):
     :return: the requested data
     :rtype: c_double, (c_double), or NoneType
     """
-    if name: name = name.encode()
+    if name: name = _encode(name)
     else: return None
-    if group: group = group.encode()
+    if group: group = _encode(group)
     if vartype == LMP_VAR_EQUAL:
-      self.lib.lammps_extract_variable.restype = POINTER(c_double)
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_variable(self.lmp,name,group)
-      if ptr: result = ptr[0]
-      else: return None
+      if self._has_variable_scalar:
+        value = self._variable_value
+        err = self._fast_lib.lammps_extract_variable_scalar(self._fast_lmp,name,value)
+        self._check_error()
+        if not err: return value[0]
+        if err < 0: return None
+      # older libraries and atom-style variables return the value
+      # (the first of the per-atom values) in memory that must be freed
+      ptr = self.lib.lammps_extract_variable(self.lmp,name,group)
+      self._check_error()
+      if not ptr: return None
+      result = ptr[0]
       self.lib.lammps_free(ptr)
       return result
     elif vartype == LMP_VAR_ATOM:
       nlocal = self.extract_global("nlocal")
       result = (c_double*nlocal)()
-      self.lib.lammps_extract_variable.restype = POINTER(c_double)
-      with ExceptionCheck(self):
-        ptr = self.lib.lammps_extract_variable(self.lmp,name,group)
+      ptr = self.lib.lammps_extract_variable(self.lmp,name,group)
+      self._check_error()
       if ptr:
-        for i in range(nlocal): result[i] = ptr[i]
+        memmove(result, ptr, sizeof(result))
         self.lib.lammps_free(ptr)
       else: return None
       return result
@@ -1098,16 +1426,17 @@ class lammps(object):
     :param name: name of the variable
     :type name: string
     :param value: new variable value
-    :type value: any. will be converted to a string
+    :type value: any. will be converted to a string unless it is bytes or bytearray
     :return: either 0 on success or -1 on failure
     :rtype: int
     """
-    if name: name = name.encode()
-    else: return -1
-    if value: value = str(value).encode()
+    if name: name = _encode(name)
     else: return -1
+    if not value: return -1
+    if isinstance(value, (bytes, bytearray)): value = _encode(value)
+    else: value = str(value).encode()
     with ExceptionCheck(self):
-      return self.lib.lammps_set_variable(self.lmp,name,value)
+      return self._libfunc('lammps_set_variable')(self.lmp,name,value)
 
   # -------------------------------------------------------------------------
 
@@ -1121,46 +1450,43 @@ class lammps(object):
   #   e.g. for Python list or NumPy or ctypes
 
   def gather_atoms(self,name,type,count):
-    if name: name = name.encode()
+    if name: name = _encode(name)
     natoms = self.get_natoms()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*natoms)*c_int)()
-        self.lib.lammps_gather_atoms(self.lmp,name,type,count,data)
-      elif type == 1:
-        data = ((count*natoms)*c_double)()
-        self.lib.lammps_gather_atoms(self.lmp,name,type,count,data)
-      else:
-        return None
+    if type == 0:
+      data = ((count*natoms)*c_int)()
+    elif type == 1:
+      data = ((count*natoms)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather_atoms(self.lmp,name,type,count,data)
+    self._check_error()
     return data
 
   # -------------------------------------------------------------------------
 
   def gather_atoms_concat(self,name,type,count):
-    if name: name = name.encode()
+    if name: name = _encode(name)
     natoms = self.get_natoms()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*natoms)*c_int)()
-        self.lib.lammps_gather_atoms_concat(self.lmp,name,type,count,data)
-      elif type == 1:
-        data = ((count*natoms)*c_double)()
-        self.lib.lammps_gather_atoms_concat(self.lmp,name,type,count,data)
-      else:
-          return None
+    if type == 0:
+      data = ((count*natoms)*c_int)()
+    elif type == 1:
+      data = ((count*natoms)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather_atoms_concat(self.lmp,name,type,count,data)
+    self._check_error()
     return data
 
   def gather_atoms_subset(self,name,type,count,ndata,ids):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*ndata)*c_int)()
-        self.lib.lammps_gather_atoms_subset(self.lmp,name,type,count,ndata,ids,data)
-      elif type == 1:
-        data = ((count*ndata)*c_double)()
-        self.lib.lammps_gather_atoms_subset(self.lmp,name,type,count,ndata,ids,data)
-      else:
-        return None
+    if name: name = _encode(name)
+    if type == 0:
+      data = ((count*ndata)*c_int)()
+    elif type == 1:
+      data = ((count*ndata)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather_atoms_subset(self.lmp,name,type,count,ndata,ids,data)
+    self._check_error()
     return data
 
   # -------------------------------------------------------------------------
@@ -1170,21 +1496,28 @@ class lammps(object):
   # name = atom property recognized by LAMMPS in atom->extract()
   # type = 0 for integer values, 1 for double values
   # count = number of per-atom valus, 1 for type or charge, 3 for x or f
-  # assume data is of correct type and length, as created by gather_atoms()
-  # NOTE: need to insure are converting to/from correct Python type
-  #   e.g. for Python list or NumPy or ctypes
+  # data may be a ctypes array as created by gather_atoms(), which is used
+  # as is, or any other sequence or buffer, e.g. a list or NumPy array,
+  # which is converted to a ctypes array of the correct type and length.
+  # buffers with matching type and layout are used without copying.
 
   def scatter_atoms(self,name,type,count,data):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      self.lib.lammps_scatter_atoms(self.lmp,name,type,count,data)
+    if name: name = _encode(name)
+    if not isinstance(data, Array):
+      data = self._scatter_data(type,count*self.get_natoms(),data)
+    self.lib.lammps_scatter_atoms(self.lmp,name,type,count,data)
+    self._check_error()
 
   # -------------------------------------------------------------------------
 
   def scatter_atoms_subset(self,name,type,count,ndata,ids,data):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      self.lib.lammps_scatter_atoms_subset(self.lmp,name,type,count,ndata,ids,data)
+    if name: name = _encode(name)
+    if not isinstance(ids, Array):
+      ids = self._scatter_data(0,ndata,ids)
+    if not isinstance(data, Array):
+      data = self._scatter_data(type,count*ndata,data)
+    self.lib.lammps_scatter_atoms_subset(self.lmp,name,type,count,ndata,ids,data)
+    self._check_error()
 
   # return vector of atom/compute/fix properties gathered across procs
   # 3 variants to match src/library.cpp
@@ -1195,44 +1528,58 @@ class lammps(object):
   # NOTE: need to insure are converting to/from correct Python type
   #   e.g. for Python list or NumPy or ctypes
   def gather(self,name,type,count):
-    if name: name = name.encode()
+    if name: name = _encode(name)
     natoms = self.get_natoms()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*natoms)*c_int)()
-        self.lib.lammps_gather(self.lmp,name,type,count,data)
-      elif type == 1:
-        data = ((count*natoms)*c_double)()
-        self.lib.lammps_gather(self.lmp,name,type,count,data)
-      else:
-        return None
+    if type == 0:
+      data = ((count*natoms)*c_int)()
+    elif type == 1:
+      data = ((count*natoms)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather(self.lmp,name,type,count,data)
+    self._check_error()
     return data
 
+  # gather multiple properties with the same type and count, e.g. x, v, and f,
+  # so that the number of atoms needs to be looked up only once
+
+  def gather_many(self,names,type,count):
+    if type == 0: ctype = c_int
+    elif type == 1: ctype = c_double
+    else: return None
+    natoms = self.get_natoms()
+    result = []
+    for name in names:
+      if name: name = _encode(name)
+      data = ((count*natoms)*ctype)()
+      self.lib.lammps_gather(self.lmp,name,type,count,data)
+      self._check_error()
+      result.append(data)
+    return result
+
   def gather_concat(self,name,type,count):
-    if name: name = name.encode()
+    if name: name = _encode(name)
     natoms = self.get_natoms()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*natoms)*c_int)()
-        self.lib.lammps_gather_concat(self.lmp,name,type,count,data)
-      elif type == 1:
-        data = ((count*natoms)*c_double)()
-        self.lib.lammps_gather_concat(self.lmp,name,type,count,data)
-      else:
-        return None
+    if type == 0:
+      data = ((count*natoms)*c_int)()
+    elif type == 1:
+      data = ((count*natoms)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather_concat(self.lmp,name,type,count,data)
+    self._check_error()
     return data
 
   def gather_subset(self,name,type,count,ndata,ids):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      if type == 0:
-        data = ((count*ndata)*c_int)()
-        self.lib.lammps_gather_subset(self.lmp,name,type,count,ndata,ids,data)
-      elif type == 1:
-        data = ((count*ndata)*c_double)()
-        self.lib.lammps_gather_subset(self.lmp,name,type,count,ndata,ids,data)
-      else:
-        return None
+    if name: name = _encode(name)
+    if type == 0:
+      data = ((count*ndata)*c_int)()
+    elif type == 1:
+      data = ((count*ndata)*c_double)()
+    else:
+      return None
+    self.lib.lammps_gather_subset(self.lmp,name,type,count,ndata,ids,data)
+    self._check_error()
     return data
 
   # scatter vector of atom/compute/fix properties across procs
@@ -1240,21 +1587,51 @@ class lammps(object):
   # name = atom property recognized by LAMMPS in atom->extract()
   # type = 0 for integer values, 1 for double values
   # count = number of per-atom valus, 1 for type or charge, 3 for x or f
-  # assume data is of correct type and length, as created by gather_atoms()
-  # NOTE: need to insure are converting to/from correct Python type
-  #   e.g. for Python list or NumPy or ctypes
+  # data is converted the same way as for scatter_atoms()
 
   def scatter(self,name,type,count,data):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      self.lib.lammps_scatter(self.lmp,name,type,count,data)
+    if name: name = _encode(name)
+    if not isinstance(data, Array):
+      data = self._scatter_data(type,count*self.get_natoms(),data)
+    self.lib.lammps_scatter(self.lmp,name,type,count,data)
+    self._check_error()
 
   def scatter_subset(self,name,type,count,ndata,ids,data):
-    if name: name = name.encode()
-    with ExceptionCheck(self):
-      self.lib.lammps_scatter_subset(self.lmp,name,type,count,ndata,ids,data)
+    if name: name = _encode(name)
+    if not isinstance(ids, Array):
+      ids = self._scatter_data(0,ndata,ids)
+    if not isinstance(data, Array):
+      data = self._scatter_data(type,count*ndata,data)
+    self.lib.lammps_scatter_subset(self.lmp,name,type,count,ndata,ids,data)
+    self._check_error()
+
+  # gather data of all atoms into a writable buffer, e.g. a NumPy array,
+  # through the fast library if available.  otherwise the buffer is passed
+  # by reference, which is faster than creating a ctypes pointer for it.
+
+  def _gather_into(self,fname,name,type,count,data):
+    if self._fast_lib is self.lib:
+      # a zero length array also works for empty buffers, e.g. without atoms
+      data = byref((c_char*0).from_buffer(data))
+    else:
+      data = _ffi.from_buffer(data)
+    getattr(self._fast_lib,fname)(self._fast_lmp,name,type,count,data)
+    self._check_error()
+
+  # convert data or atom IDs for the scatter functions.  data that cannot be converted
+  # is passed on unchanged, so that ctypes reports the invalid argument.
+
+  def _scatter_data(self,type,n,data):
+    if type == 0:
+      result = _as_c_array(c_int,data,n)
+    elif type == 1:
+      result = _as_c_array(c_double,data,n)
+    else:
+      return data
+    if result is None: return data
+    return result
 
-   # -------------------------------------------------------------------------
+  # -------------------------------------------------------------------------
 
   def encode_image_flags(self,ix,iy,iz):
     """ convert 3 integers with image flags for x-, y-, and z-direction
@@ -1288,10 +1665,12 @@ class lammps(object):
     :rtype: list of 3 int
     """
 
-    flags = (c_int*3)()
-    self.lib.lammps_decode_image_flags(image,byref(flags))
+    # the flags are decoded into a buffer that is reused for every call.
+    # ctypes passes it by reference since the argument is a pointer.
+    flags = self._image_flags
+    self.lib.lammps_decode_image_flags(image,flags)
 
-    return [int(i) for i in flags]
+    return flags[:]
 
   # -------------------------------------------------------------------------
 
@@ -1317,11 +1696,13 @@ class lammps(object):
 
     The lists of coordinates, types, atom IDs, velocities, image flags can
     be provided in any format that may be converted into the required
-    internal data types.  Also the list may contain more than *N* entries,
-    but not fewer.  In the latter case, the function will return without
-    attempting to create atoms.  You may use the :py:func:`encode_image_flags
-    <lammps.encode_image_flags>` method to properly combine three integers
-    with image flags into a single integer.
+    internal data types.  Contiguous arrays supporting the buffer protocol
+    (e.g. NumPy arrays) that already have the internal data type and are
+    writable are passed to the library without copying.  Also the list may
+    contain more than *N* entries, but not fewer.  In the latter case, the
+    function will return without attempting to create atoms.  You may use
+    the :py:func:`encode_image_flags <lammps.encode_image_flags>` method to
+    properly combine three integers with image flags into a single integer.
 
     :param n: number of atoms for which data is provided
     :type n: int
@@ -1340,43 +1721,28 @@ class lammps(object):
     :return: number of atoms created. 0 if insufficient or invalid data
     :rtype: int
     """
-    if id:
-      id_lmp = (self.c_tagint*n)()
-      try:
-        id_lmp[:] = id[0:n]
-      except:
-        return 0
+    if id is not None and len(id):
+      id_lmp = _as_c_array(self.c_tagint, id, n)
+      if id_lmp is None: return 0
     else:
       id_lmp = None
 
-    type_lmp = (c_int*n)()
-    try:
-      type_lmp[:] = type[0:n]
-    except:
-      return 0
+    type_lmp = _as_c_array(c_int, type, n)
+    if type_lmp is None: return 0
 
     three_n = 3*n
-    x_lmp = (c_double*three_n)()
-    try:
-      x_lmp[:] = x[0:three_n]
-    except:
-      return 0
+    x_lmp = _as_c_array(c_double, x, three_n)
+    if x_lmp is None: return 0
 
-    if v:
-      v_lmp = (c_double*(three_n))()
-      try:
-        v_lmp[:] = v[0:three_n]
-      except:
-        return 0
+    if v is not None and len(v):
+      v_lmp = _as_c_array(c_double, v, three_n)
+      if v_lmp is None: return 0
     else:
       v_lmp = None
 
-    if image:
-      img_lmp = (self.c_imageint*n)()
-      try:
-        img_lmp[:] = image[0:n]
-      except:
-        return 0
+    if image is not None and len(image):
+      img_lmp = _as_c_array(self.c_imageint, image, n)
+      if img_lmp is None: return 0
     else:
       img_lmp = None
 
@@ -1385,13 +1751,19 @@ class lammps(object):
     else:
       se_lmp = 0
 
-    self.lib.lammps_create_atoms.argtypes = [c_void_p, c_int, POINTER(self.c_tagint*n),
-                                     POINTER(c_int*n), POINTER(c_double*three_n),
-                                     POINTER(c_double*three_n),
-                                     POINTER(self.c_imageint*n), c_int]
     with ExceptionCheck(self):
       return self.lib.lammps_create_atoms(self.lmp, n, id_lmp, type_lmp, x_lmp, v_lmp, img_lmp, se_lmp)
 
+  # -------------------------------------------------------------------------
+  # return the setting of a feature compiled into the library.  these
+  # cannot change, so the library is queried only once for each of them.
+
+  def _config_flag(self, name):
+    value = self._config_flags.get(name)
+    if value is None:
+      value = self._config_flags[name] = self._libfunc(name)() != 0
+    return value
+
   # -------------------------------------------------------------------------
 
   @property
@@ -1405,7 +1777,7 @@ class lammps(object):
     :return: False when compiled with MPI STUBS, otherwise True
     :rtype: bool
     """
-    return self.lib.lammps_config_has_mpi_support() != 0
+    return self._config_flag('lammps_config_has_mpi_support')
 
   # -------------------------------------------------------------------------
 
@@ -1423,7 +1795,7 @@ class lammps(object):
     :return: True when called during a run otherwise false
     :rtype: bool
     """
-    return self.lib.lammps_is_running(self.lmp) == 1
+    return self._libfunc('lammps_is_running')(self.lmp) == 1
 
   # -------------------------------------------------------------------------
 
@@ -1437,7 +1809,7 @@ class lammps(object):
 
     .. versionadded:: 9Oct2020
     """
-    self.lib.lammps_force_timeout(self.lmp)
+    self._libfunc('lammps_force_timeout')(self.lmp)
 
   # -------------------------------------------------------------------------
 
@@ -1452,7 +1824,7 @@ class lammps(object):
     :return: state of C++ exception support
     :rtype: bool
     """
-    return self.lib.lammps_config_has_exceptions() != 0
+    return self._config_flag('lammps_config_has_exceptions')
 
   # -------------------------------------------------------------------------
 
@@ -1467,7 +1839,7 @@ class lammps(object):
     :return: state of gzip support
     :rtype: bool
     """
-    return self.lib.lammps_config_has_gzip_support() != 0
+    return self._config_flag('lammps_config_has_gzip_support')
 
   # -------------------------------------------------------------------------
 
@@ -1482,7 +1854,7 @@ class lammps(object):
     :return: state of PNG support
     :rtype: bool
     """
-    return self.lib.lammps_config_has_png_support() != 0
+    return self._config_flag('lammps_config_has_png_support')
 
   # -------------------------------------------------------------------------
 
@@ -1497,7 +1869,7 @@ class lammps(object):
     :return: state of JPEG support
     :rtype: bool
     """
-    return self.lib.lammps_config_has_jpeg_support() != 0
+    return self._config_flag('lammps_config_has_jpeg_support')
 
   # -------------------------------------------------------------------------
 
@@ -1511,7 +1883,7 @@ class lammps(object):
     :return: state of ffmpeg support
     :rtype: bool
     """
-    return self.lib.lammps_config_has_ffmpeg_support() != 0
+    return self._config_flag('lammps_config_has_ffmpeg_support')
 
   # -------------------------------------------------------------------------
 
@@ -1522,25 +1894,25 @@ class lammps(object):
     This is a wrapper around the :cpp:func:`lammps_config_accelerator`
     function of the library interface which loops over all known packages
     and categories and returns enabled features as a nested dictionary
-    with all enabled settings as list of strings.
+    with all enabled settings as list of strings.  The library is only queried
+    on the first access, since the settings cannot change.
 
     :return: nested dictionary with all known enabled settings as list of strings
     :rtype: dictionary
     """
 
-    result = {}
-    for p in ['GPU', 'KOKKOS', 'USER-INTEL', 'USER-OMP']:
+    if self._accelerator_config is not None:
+      return self._accelerator_config
+
+    config_accelerator = self._libfunc('lammps_config_accelerator')
+    result = self._accelerator_config = {}
+    for p, pb in _ACCELERATOR_PACKAGES:
       result[p] = {}
-      c = 'api'
-      result[p][c] = []
-      for s in ['cuda', 'hip', 'phi', 'pthreads', 'opencl', 'openmp', 'serial']:
-        if self.lib.lammps_config_accelerator(p.encode(),c.encode(),s.encode()):
-          result[p][c].append(s)
-      c = 'precision'
-      result[p][c] = []
-      for s in ['double', 'mixed', 'single']:
-        if self.lib.lammps_config_accelerator(p.encode(),c.encode(),s.encode()):
-          result[p][c].append(s)
+      for c, cb, settings in _ACCELERATOR_CATEGORIES:
+        result[p][c] = []
+        for s, sb in settings:
+          if config_accelerator(pb,cb,sb):
+            result[p][c].append(s)
     return result
 
   # -------------------------------------------------------------------------
@@ -1554,14 +1926,16 @@ class lammps(object):
 
     :return
     """
-    if self._installed_packages is None:
-      self._installed_packages = []
-      npackages = self.lib.lammps_config_package_count()
-      sb = create_string_buffer(100)
+    if self.lib._installed_packages is None:
+      npackages = self._libfunc('lammps_config_package_count')()
+      package_name = self._libfunc('lammps_config_package_name')
+      sb = self._name_buffer
+      packages = []
       for idx in range(npackages):
-        self.lib.lammps_config_package_name(idx, sb, 100)
-        self._installed_packages.append(sb.value.decode())
-    return self._installed_packages
+        package_name(idx, sb, _NAME_BUFFER_SIZE)
+        packages.append(sb.value.decode())
+      self.lib._installed_packages = packages
+    return self.lib._installed_packages
 
   # -------------------------------------------------------------------------
 
@@ -1579,15 +1953,16 @@ class lammps(object):
     :return: true if style is available in given category
     :rtype:  bool
     """
-    return self.lib.lammps_has_style(self.lmp, category.encode(), name.encode()) != 0
+    return self._libfunc('lammps_has_style')(self.lmp, _encode(category), _encode(name)) != 0
 
   # -------------------------------------------------------------------------
 
   def available_styles(self, category):
     """Returns a list of styles available for a given category
 
-    This is a wrapper around the functions :cpp:func:`lammps_style_count()`
-    and :cpp:func:`lammps_style_name()` of the library interface.
+    This is a wrapper around the function :cpp:func:`lammps_style_names()`
+    of the library interface, or the functions :cpp:func:`lammps_style_count()`
+    and :cpp:func:`lammps_style_name()` for older versions of the library.
 
     :param category: name of category
     :type  category: string
@@ -1595,19 +1970,27 @@ class lammps(object):
     :return: list of style names in given category
     :rtype:  list
     """
-    if self._available_styles is None:
-      self._available_styles = {}
-
-    if category not in self._available_styles:
-      self._available_styles[category] = []
-      with ExceptionCheck(self):
-        nstyles = self.lib.lammps_style_count(self.lmp, category.encode())
-      sb = create_string_buffer(100)
-      for idx in range(nstyles):
+    # categories are cached and compared as strings, so decode bytes
+    if isinstance(category, (bytes, bytearray)) and not isinstance(category, str):
+      category = category.decode()
+    available_styles = self._available.get(('style', category))
+    if available_styles is None:
+      cat = _encode(category)
+      if hasattr(self.lib, 'lammps_style_names'):
+        available_styles = self._names('lammps_style_names', cat)
+      else:
+        # older libraries can only return one name per call
+        available_styles = []
+        with ExceptionCheck(self):
+          nstyles = self._libfunc('lammps_style_count')(self.lmp, cat)
+        style_name = self._libfunc('lammps_style_name')
+        sb = self._name_buffer
         with ExceptionCheck(self):
-          self.lib.lammps_style_name(self.lmp, category.encode(), idx, sb, 100)
-        self._available_styles[category].append(sb.value.decode())
-    return self._available_styles[category]
+          for idx in range(nstyles):
+            style_name(self.lmp, cat, idx, sb, _NAME_BUFFER_SIZE)
+            available_styles.append(sb.value.decode())
+      self._available[('style', category)] = available_styles
+    return available_styles
 
   # -------------------------------------------------------------------------
 
@@ -1627,15 +2010,22 @@ class lammps(object):
     :return: true if ID is available in given category
     :rtype:  bool
     """
-    return self.lib.lammps_has_id(self.lmp, category.encode(), name.encode()) != 0
+    return self._libfunc('lammps_has_id')(self.lmp, _encode(category), _encode(name)) != 0
 
   # -------------------------------------------------------------------------
 
   def available_ids(self, category):
     """Returns a list of IDs available for a given category
 
-    This is a wrapper around the functions :cpp:func:`lammps_id_count()`
-    and :cpp:func:`lammps_id_name()` of the library interface.
+    This is a wrapper around the function :cpp:func:`lammps_id_names()`
+    of the library interface, or the functions :cpp:func:`lammps_id_count()`
+    and :cpp:func:`lammps_id_name()` for older versions of the library.
+    The list is cached until the next input is processed through this
+    :py:class:`lammps` instance, so it should not be modified.  Input
+    processed through a different :py:class:`lammps` instance for the same
+    LAMMPS object does not clear the cache.  Instances created with the
+    ``ptr`` argument, e.g. inside Python functions called from LAMMPS, do
+    not cache the list.
 
     .. versionadded:: 9Oct2020
 
@@ -1646,14 +2036,23 @@ class lammps(object):
     :rtype:  list
     """
 
-    categories = ['compute','dump','fix','group','molecule','region','variable']
-    available_ids = []
-    if category in categories:
-      num = self.lib.lammps_id_count(self.lmp, category.encode())
-      sb = create_string_buffer(100)
-      for idx in range(num):
-        self.lib.lammps_id_name(self.lmp, category.encode(), idx, sb, 100)
-        available_ids.append(sb.value.decode())
+    # categories are cached and compared as strings, so decode bytes
+    if isinstance(category, (bytes, bytearray)) and not isinstance(category, str):
+      category = category.decode()
+    available_ids = self._available.get(('id', category))
+    if available_ids is None:
+      available_ids = []
+      if category in _ID_CATEGORIES and hasattr(self.lib, 'lammps_id_names'):
+        available_ids = self._names('lammps_id_names', _encode(category))
+      elif category in _ID_CATEGORIES:
+        cat = _encode(category)
+        num = self._libfunc('lammps_id_count')(self.lmp, cat)
+        id_name = self._libfunc('lammps_id_name')
+        sb = self._name_buffer
+        for idx in range(num):
+          id_name(self.lmp, cat, idx, sb, _NAME_BUFFER_SIZE)
+          available_ids.append(sb.value.decode())
+      self._available[('id', category)] = available_ids
     return available_ids
 
   # -------------------------------------------------------------------------
@@ -1663,31 +2062,83 @@ class lammps(object):
 
     This is a wrapper around the functions :cpp:func:`lammps_plugin_count()`
     and :cpp:func:`lammps_plugin_name()` of the library interface.
+    The list is cached the same way as for :py:meth:`available_ids`.
 
     .. versionadded:: 10Mar2021
 
-    :return: list of style/name pairs of loaded plugins
+    :return: list of (style, name) named tuples of loaded plugins
     :rtype:  list
     """
 
-    available_plugins = []
-    num = self.lib.lammps_plugin_count(self.lmp)
-    sty = create_string_buffer(100)
-    nam = create_string_buffer(100)
-    for idx in range(num):
-      self.lib.lammps_plugin_name(idx, sty, nam, 100)
-      available_plugins.append([sty.value.decode(), nam.value.decode()])
+    available_plugins = self._available.get('plugin')
+    if available_plugins is None:
+      available_plugins = []
+      num = self._libfunc('lammps_plugin_count')(self.lmp)
+      plugin_name = self._libfunc('lammps_plugin_name')
+      sty = self._name_buffer
+      nam = self._name_buffer2
+      for idx in range(num):
+        plugin_name(idx, sty, nam, _NAME_BUFFER_SIZE)
+        available_plugins.append(Plugin(sty.value.decode(), nam.value.decode()))
+      self._available['plugin'] = available_plugins
     return available_plugins
 
   # -------------------------------------------------------------------------
 
+  def snapshot(self):
+    """Returns all available styles, IDs, and plugins at once
+
+    This collects the results of :py:meth:`available_styles`,
+    :py:meth:`available_ids`, and :py:meth:`available_plugins`
+    for all categories.  All lists are cached as for those methods, so
+    subsequent calls of them are answered without calling the library.
+
+    :return: dictionary with the keys 'styles' and 'ids', each mapping
+             category names to lists of names, and 'plugins'
+    :rtype:  dict
+    """
+    return {
+      'styles'  : dict((c, self.available_styles(c)) for c in _STYLE_CATEGORIES),
+      'ids'     : dict((c, self.available_ids(c)) for c in _ID_CATEGORIES),
+      'plugins' : self.available_plugins(''),
+    }
+
+  # -------------------------------------------------------------------------
+
+  def _names(self, fname, category):
+    # query the required buffer size first and then get all names at once
+    get_names = self._libfunc(fname)
+    with ExceptionCheck(self):
+      nbytes = get_names(self.lmp, category, None, 0)
+    sb = create_string_buffer(nbytes)
+    with ExceptionCheck(self):
+      get_names(self.lmp, category, sb, nbytes)
+    return [name.decode() for name in sb.raw.split(b'\0')[:-1]]
+
+  # -------------------------------------------------------------------------
+
   def set_fix_external_callback(self, fix_name, callback, caller=None):
-    import numpy as np
+    # the callback is called every time step, so look up everything
+    # that is needed to create the NumPy arrays only once.  the per-atom
+    # arrays are only reallocated occasionally, so the NumPy arrays are
+    # only re-created when the number of atoms or an address changes.
+    iarray = self.numpy.iarray
+    darray = self.numpy.darray
+    c_tagint = self.c_tagint
+    P_TAGINT = POINTER(c_tagint)
+    views = [None, None]
 
     def callback_wrapper(caller, ntimestep, nlocal, tag_ptr, x_ptr, fext_ptr):
-      tag = self.numpy.iarray(self.c_tagint, tag_ptr, nlocal, 1)
-      x   = self.numpy.darray(x_ptr, nlocal, 3)
-      f   = self.numpy.darray(fext_ptr, nlocal, 3)
+      key = (nlocal, tag_ptr,
+             c_void_p.from_address(x_ptr).value if x_ptr else None,
+             c_void_p.from_address(fext_ptr).value if fext_ptr else None)
+      if key != views[0]:
+        tag = iarray(c_tagint, cast(tag_ptr, P_TAGINT), nlocal, 1)
+        x   = darray(cast(x_ptr, _PP_DOUBLE), nlocal, 3)
+        f   = darray(cast(fext_ptr, _PP_DOUBLE), nlocal, 3)
+        views[0] = key
+        views[1] = (tag, x, f)
+      tag, x, f = views[1]
       callback(caller, ntimestep, nlocal, tag, x, f)
 
     cFunc   = self.FIX_EXTERNAL_CALLBACK_FUNC(callback_wrapper)
@@ -1695,7 +2146,7 @@ class lammps(object):
 
     self.callback[fix_name] = { 'function': cFunc, 'caller': caller }
     with ExceptionCheck(self):
-      self.lib.lammps_set_fix_external_callback(self.lmp, fix_name.encode(), cFunc, cCaller)
+      self.lib.lammps_set_fix_external_callback(self.lmp, _encode(fix_name), cFunc, cCaller)
 
 
   # -------------------------------------------------------------------------
@@ -1725,7 +2176,7 @@ class lammps(object):
     :return: number of elements in neighbor list with index idx
     :rtype:  int
      """
-    return self.lib.lammps_neighlist_num_elements(self.lmp, idx)
+    return self._neighlist_num_elements(self.lmp, idx)
 
   # -------------------------------------------------------------------------
 
@@ -1739,14 +2190,41 @@ class lammps(object):
     :return: tuple with atom local index, number of neighbors and array of neighbor local atom indices
     :rtype:  (int, int, POINTER(c_int))
     """
-    c_iatom = c_int()
-    c_numneigh = c_int()
-    c_neighbors = POINTER(c_int)()
-    self.lib.lammps_neighlist_element_neighbors(self.lmp, idx, element, byref(c_iatom), byref(c_numneigh), byref(c_neighbors))
+    c_iatom, c_numneigh = self._neighlist_element
+    c_neighbors = _P_INT()
+    self._neighlist_element_neighbors(self.lmp, idx, element, c_iatom, c_numneigh, byref(c_neighbors))
     return c_iatom.value, c_numneigh.value, c_neighbors
 
   # -------------------------------------------------------------------------
 
+  def get_neighlist_elements(self, idx):
+    """Return data of all entries of a neighbor list
+
+    This is a wrapper around the function :cpp:func:`lammps_neighlist_elements()`
+    of the library interface, which retrieves the same data as calling
+    :py:meth:`get_neighlist_element_neighbors` for all elements, but with
+    a single call.  For older versions of the library the elements are
+    retrieved one by one.
+
+    :param idx: neighbor list index
+    :type  idx: int
+    :return: tuple with arrays of atom local indices, numbers of neighbors, and arrays of neighbor local atom indices
+    :rtype:  (c_int array, c_int array, POINTER(c_int) array)
+    """
+    nelem = max(self.get_neighlist_size(idx), 0)
+    iatoms = (c_int*nelem)()
+    numneigh = (c_int*nelem)()
+    neighbors = (_P_INT*nelem)()
+    if hasattr(self.lib, 'lammps_neighlist_elements'):
+      self._libfunc('lammps_neighlist_elements')(self.lmp, idx, nelem, iatoms, numneigh, neighbors)
+    else:
+      for element in range(nelem):
+        iatoms[element], numneigh[element], neighbors[element] = \
+          self.get_neighlist_element_neighbors(idx, element)
+    return iatoms, numneigh, neighbors
+
+  # -------------------------------------------------------------------------
+
   def find_pair_neighlist(self, style, exact=True, nsub=0, request=0):
     """Find neighbor list index of pair style neighbor list
 
@@ -1759,6 +2237,9 @@ class lammps(object):
     index. Thus, providing this request index ensures that the correct neighbor
     list index is returned.
 
+    Found indices are cached the same way as the lists returned by
+    :py:meth:`available_ids`.
+
     :param style: name of pair style that should be searched for
     :type  style: string
     :param exact: controls whether style should match exactly or only must be contained in pair style name, defaults to True
@@ -1770,10 +2251,7 @@ class lammps(object):
     :return: neighbor list index if found, otherwise -1
     :rtype:  int
      """
-    style = style.encode()
-    exact = int(exact)
-    idx = self.lib.lammps_find_pair_neighlist(self.lmp, style, exact, nsub, request)
-    return idx
+    return self._find_neighlist('pair', style, request, int(exact), nsub)
 
   # -------------------------------------------------------------------------
 
@@ -1787,9 +2265,7 @@ class lammps(object):
     :return: neighbor list index if found, otherwise -1
     :rtype:  int
      """
-    fixid = fixid.encode()
-    idx = self.lib.lammps_find_fix_neighlist(self.lmp, fixid, request)
-    return idx
+    return self._find_neighlist('fix', fixid, request)
 
   # -------------------------------------------------------------------------
 
@@ -1803,6 +2279,19 @@ class lammps(object):
     :return: neighbor list index if found, otherwise -1
     :rtype:  int
      """
-    computeid = computeid.encode()
-    idx = self.lib.lammps_find_compute_neighlist(self.lmp, computeid, request)
+    return self._find_neighlist('compute', computeid, request)
+
+  # -------------------------------------------------------------------------
+
+  def _find_neighlist(self, kind, name, request, *extra):
+    # neighbor lists are only created or deleted while processing input,
+    # so the index is cached until then.  -1 for "not found" is not cached,
+    # since the list may be created later, e.g. by a run.
+    # pair styles take additional arguments before the request index.
+    key = ('neighlist', kind, _key(name), request) + extra
+    idx = self._available.get(key)
+    if idx is None:
+      args = (self.lmp, _encode(name)) + extra + (request,)
+      idx = self._libfunc(_FIND_NEIGHLIST[kind])(*args)
+      if idx >= 0: self._available[key] = idx
     return idx
@@ -16,6 +16,11 @@
 # Written by Richard Berger <richard.berger@temple.edu>
 ################################################################################
 
+from collections import namedtuple
+
+# style/name pair of a loaded plugin as returned by lammps.available_plugins()
+Plugin = namedtuple('Plugin', 'style name')
+
 class NeighList:
     """This is a wrapper class that exposes the contents of a neighbor list.
 
@@ -17,10 +17,13 @@
 ################################################################################
 
 import warnings
-from ctypes import POINTER, c_double, c_int, c_int32, c_int64, cast
+from ctypes import POINTER, c_double, c_int, c_int32, c_int64, c_void_p, cast
+
+import numpy as np
 
 
 from .constants import *
+from .core import _encode
 from .data import NeighList
 
 
@@ -44,16 +47,6 @@ class numpy_wrapper:
 
   # -------------------------------------------------------------------------
 
-  def _ctype_to_numpy_int(self, ctype_int):
-    import numpy as np
-    if ctype_int == c_int32:
-      return np.int32
-    elif ctype_int == c_int64:
-      return np.int64
-    return np.intc
-
-  # -------------------------------------------------------------------------
-
   def extract_atom(self, name, dtype=LAMMPS_AUTODETECT, nelem=LAMMPS_AUTODETECT, dim=LAMMPS_AUTODETECT):
     """Retrieve per-atom properties from LAMMPS as NumPy arrays
 
@@ -240,7 +233,6 @@ class numpy_wrapper:
     :return: the requested data or None
     :rtype: c_double, numpy.array, or NoneType
     """
-    import numpy as np
     value = self.lmp.extract_variable(name, group, vartype)
     if vartype == LMP_VAR_ATOM:
       return np.ctypeslib.as_array(value)
@@ -248,6 +240,138 @@ class numpy_wrapper:
 
   # -------------------------------------------------------------------------
 
+  def extract_box(self):
+    """Extract simulation box parameters
+
+    This function is a wrapper around the function
+    :py:meth:`lammps.extract_box() <lammps.lammps.extract_box()>`
+    method. It behaves the same as the original method, but returns NumPy arrays
+    for the box boundaries and periodicity instead of lists.
+
+    :return: tuple of the extracted data: boxlo, boxhi, xy, yz, xz, periodicity, box_change
+    :rtype: (numpy.array, numpy.array, float, float, float, numpy.array, int)
+    """
+    boxlo = (3*c_double)()
+    boxhi = (3*c_double)()
+    xy = c_double()
+    yz = c_double()
+    xz = c_double()
+    periodicity = (3*c_int)()
+    box_change = c_int()
+
+    self.lmp.lib.lammps_extract_box(self.lmp.lmp,boxlo,boxhi,xy,yz,xz,
+                                    periodicity,box_change)
+    self.lmp._check_error()
+
+    # the arrays are allocated for each call, so they can be used without copy
+    return np.ctypeslib.as_array(boxlo), np.ctypeslib.as_array(boxhi), \
+           xy.value, yz.value, xz.value, \
+           np.ctypeslib.as_array(periodicity), box_change.value
+
+  # -------------------------------------------------------------------------
+
+  def gather_atoms(self, name, type, count):
+    """Gather a per-atom property of all atoms ordered by atom ID
+
+    This function is a wrapper around the function
+    :py:meth:`lammps.gather_atoms() <lammps.lammps.gather_atoms()>`
+    method. It behaves the same as the original method, but returns
+    the data in a NumPy array instead of a ``ctypes`` array.
+
+    :param name: name of the property
+    :type name: string
+    :param type: 0 for integer values, 1 for double values
+    :type type: int
+    :param count: number of values per atom
+    :type count: int
+    :return: 1d NumPy array with count values per atom or None
+    :rtype: numpy.array or NoneType
+    """
+    return self._gather('lammps_gather_atoms', name, type, count,
+                        self.lmp.get_natoms())
+
+  # -------------------------------------------------------------------------
+
+  def gather_atoms_concat(self, name, type, count):
+    """Gather a per-atom property of all atoms concatenated across processes
+
+    Same as :py:meth:`gather_atoms`, but wraps
+    :py:meth:`lammps.gather_atoms_concat() <lammps.lammps.gather_atoms_concat()>`.
+    """
+    return self._gather('lammps_gather_atoms_concat', name, type, count,
+                        self.lmp.get_natoms())
+
+  # -------------------------------------------------------------------------
+
+  def gather_atoms_subset(self, name, type, count, ndata, ids):
+    """Gather a per-atom property of a subset of atoms given by their IDs
+
+    Same as :py:meth:`gather_atoms`, but wraps
+    :py:meth:`lammps.gather_atoms_subset() <lammps.lammps.gather_atoms_subset()>`.
+    The atom IDs may be given as any sequence of integers.
+    """
+    return self._gather('lammps_gather_atoms_subset', name, type, count,
+                        ndata, ids)
+
+  # -------------------------------------------------------------------------
+
+  def gather(self, name, type, count):
+    """Gather a per-atom, compute, or fix property of all atoms ordered by atom ID
+
+    Same as :py:meth:`gather_atoms`, but wraps
+    :py:meth:`lammps.gather() <lammps.lammps.gather()>`.
+    """
+    return self._gather('lammps_gather', name, type, count,
+                        self.lmp.get_natoms())
+
+  # -------------------------------------------------------------------------
+
+  def gather_concat(self, name, type, count):
+    """Gather a per-atom, compute, or fix property of all atoms concatenated across processes
+
+    Same as :py:meth:`gather_atoms`, but wraps
+    :py:meth:`lammps.gather_concat() <lammps.lammps.gather_concat()>`.
+    """
+    return self._gather('lammps_gather_concat', name, type, count,
+                        self.lmp.get_natoms())
+
+  # -------------------------------------------------------------------------
+
+  def gather_subset(self, name, type, count, ndata, ids):
+    """Gather a per-atom, compute, or fix property of a subset of atoms given by their IDs
+
+    Same as :py:meth:`gather_atoms`, but wraps
+    :py:meth:`lammps.gather_subset() <lammps.lammps.gather_subset()>`.
+    The atom IDs may be given as any sequence of integers.
+    """
+    return self._gather('lammps_gather_subset', name, type, count,
+                        ndata, ids)
+
+  # -------------------------------------------------------------------------
+  # the library fills the whole array, so it is allocated without
+  # initialization and passed to the library without a ctypes copy.
+
+  def _gather(self, fname, name, type, count, ndata, ids=None):
+    if type == 0:
+      data = np.empty(count*ndata, dtype=np.intc)
+    elif type == 1:
+      data = np.empty(count*ndata, dtype=np.double)
+    else:
+      return None
+
+    if name: name = _encode(name)
+    if ids is None:
+      self.lmp._gather_into(fname, name, type, count, data)
+    else:
+      ids = np.ascontiguousarray(ids, dtype=np.intc)
+      getattr(self.lmp.lib, fname)(self.lmp.lmp, name, type, count, ndata,
+                                   ids.ctypes.data_as(POINTER(c_int)),
+                                   data.ctypes.data_as(c_void_p))
+      self.lmp._check_error()
+    return data
+
+  # -------------------------------------------------------------------------
+
   def get_neighlist(self, idx):
     """Returns an instance of :class:`NumPyNeighList` which wraps access to the neighbor list with the given index
 
@@ -278,36 +402,61 @@ class numpy_wrapper:
     :rtype:  (int, numpy.array)
     """
     iatom, numneigh, c_neighbors = self.lmp.get_neighlist_element_neighbors(idx, element)
-    neighbors = self.iarray(c_int, c_neighbors, numneigh, 1)
-    return iatom, neighbors
+    if not c_neighbors: return iatom, None
+    # the pointer already has the right type, so no cast is needed
+    return iatom, np.ctypeslib.as_array(c_neighbors, shape=(numneigh, 1))
+
+  # -------------------------------------------------------------------------
+
+  def get_neighlist_elements(self, idx):
+    """Return data of all entries of a neighbor list
+
+    This function is a wrapper around the
+    :py:meth:`lammps.get_neighlist_elements() <lammps.lammps.get_neighlist_elements()>`
+    method, which retrieves all elements with a single call.  The neighbors
+    of each element are returned as a C-contiguous 1d array of 32-bit integers
+    like with :py:meth:`NumPyNeighList.get_element_arrays`.
+
+    :param idx: neighbor list index
+    :type  idx: int
+    :return: tuple with numpy array of atom local indices and list of numpy arrays of neighbor local atom indices
+    :rtype:  (numpy.array, list)
+    """
+    c_iatoms, c_numneigh, c_neighbors = self.lmp.get_neighlist_elements(idx)
+    as_array = np.ctypeslib.as_array
+    empty = np.empty(0, dtype=np.intc)
+    neighbors = [as_array(ptr, shape=(n,)) if n > 0 else empty
+                 for n, ptr in zip(c_numneigh, c_neighbors)]
+    return as_array(c_iatoms), neighbors
 
   # -------------------------------------------------------------------------
 
+  # wrap data of a ctypes pointer into a NumPy array of the given shape
+  # without copying it.  the data type of the array is taken from the
+  # ctypes data type.  2d arrays are stored contiguously after the
+  # first row.
+
   def iarray(self, c_int_type, raw_ptr, nelem, dim=1):
-    import numpy as np
-    np_int_type = self._ctype_to_numpy_int(c_int_type)
+    if not raw_ptr: return None
 
     if dim == 1:
-      ptr = cast(raw_ptr, POINTER(c_int_type * nelem))
+      ptr = cast(raw_ptr, POINTER(c_int_type))
     else:
-      ptr = cast(raw_ptr[0], POINTER(c_int_type * nelem * dim))
+      ptr = cast(raw_ptr[0], POINTER(c_int_type))
 
-    a = np.frombuffer(ptr.contents, dtype=np_int_type)
-    a.shape = (nelem, dim)
-    return a
+    return np.ctypeslib.as_array(ptr, shape=(nelem, dim))
 
   # -------------------------------------------------------------------------
 
   def darray(self, raw_ptr, nelem, dim=1):
-    import numpy as np
+    if not raw_ptr: return None
+
     if dim == 1:
-      ptr = cast(raw_ptr, POINTER(c_double * nelem))
+      ptr = cast(raw_ptr, POINTER(c_double))
     else:
-      ptr = cast(raw_ptr[0], POINTER(c_double * nelem * dim))
+      ptr = raw_ptr[0]
 
-    a = np.frombuffer(ptr.contents)
-    a.shape = (nelem, dim)
-    return a
+    return np.ctypeslib.as_array(ptr, shape=(nelem, dim))
 
 # -------------------------------------------------------------------------
 
@@ -336,3 +485,19 @@ class NumPyNeighList(NeighList):
         """
         iatom, neighbors = self.lmp.numpy.get_neighlist_element_neighbors(self.idx, element)
         return iatom, neighbors
+
+    def get_element_arrays(self, element):
+        """Return the neighbors of an element as a one-dimensional array
+
+        Unlike :py:meth:`get`, the neighbors are always returned as a
+        C-contiguous 1d array of 32-bit integers, which can be passed
+        directly to functions compiled with tools like Numba.  Elements
+        without neighbors return an empty array.
+
+        :return: tuple with atom local index, numpy array of neighbor local atom indices
+        :rtype:  (int, numpy.array)
+        """
+        iatom, numneigh, c_neighbors = self.lmp.get_neighlist_element_neighbors(self.idx, element)
+        if not c_neighbors or numneigh == 0:
+            return iatom, np.empty(0, dtype=np.intc)
+        return iatom, np.ctypeslib.as_array(c_neighbors, shape=(numneigh,))
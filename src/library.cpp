@@ -1959,6 +1959,54 @@ void *lammps_extract_variable(void *handle, const char *name, const char *group)
 
 /* ---------------------------------------------------------------------- */
 
+/** Evaluate an equal-style variable and store its value.
+ *
+\verbatim embed:rst
+
+This function evaluates an *equal*\ -style or compatible variable
+like :cpp:func:`lammps_extract_variable`, but stores the value in
+the location provided by the caller instead of in newly allocated
+storage.  Thus it does not need to be freed after its use. Example:
+
+.. code-block:: c
+
+   double value;
+   if (lammps_extract_variable_scalar(handle,name,&value) == 0)
+     printf("The value of variable %s is %g\n", name, value);
+
+The same restrictions as for :cpp:func:`lammps_extract_variable`
+apply to when it is safe to evaluate the variable.
+
+\endverbatim
+ *
+ * \param  handle  pointer to a previously created LAMMPS instance
+ * \param  name    name of the variable
+ * \param  value   pointer to location for storing the value
+ * \return         0 on success, 1 if the variable is an *atom*\ -style
+ *                 variable, or -1 if no *equal*\ -style compatible
+ *                 variable of that name exists */
+
+int lammps_extract_variable_scalar(void *handle, const char *name, double *value)
+{
+  LAMMPS *lmp = (LAMMPS *) handle;
+
+  BEGIN_CAPTURE
+  {
+    int ivar = lmp->input->variable->find(name);
+    if (ivar < 0) return -1;
+    if (lmp->input->variable->atomstyle(ivar)) return 1;
+    if (!lmp->input->variable->equalstyle(ivar)) return -1;
+
+    *value = lmp->input->variable->compute_equal(ivar);
+    return 0;
+  }
+  END_CAPTURE
+
+  return -1;
+}
+
+/* ---------------------------------------------------------------------- */
+
 /** Set the value of a string-style variable.
  *
  * This function assigns a new value from the string str to the
@@ -4087,6 +4135,49 @@ void lammps_neighlist_element_neighbors(void *handle, int idx, int element, int
   *neighbors = list->firstneigh[i];
 }
 
+/* ---------------------------------------------------------------------- */
+
+/** Return atom local indices, numbers of neighbors, and arrays of neighbor
+ * local atom indices of all entries of a neighbor list
+ *
+\verbatim embed:rst
+
+This function is equivalent to calling
+:cpp:func:`lammps_neighlist_element_neighbors` for all elements of the
+neighbor list, but needs only a single call.  The provided arrays must
+have room for *nmax* elements and at most *nmax* elements are copied.
+The required size can be obtained from :cpp:func:`lammps_neighlist_num_elements`.
+
+\endverbatim
+ *
+ * \param handle          pointer to a previously created LAMMPS instance cast to ``void *``.
+ * \param idx             index of this neighbor list in the list of all neighbor lists
+ * \param nmax            maximum number of elements to copy
+ * \param[out] iatoms     local atom indices of the neighbor list entries
+ * \param[out] numneigh   numbers of neighbors of the neighbor list entries
+ * \param[out] neighbors  pointers to arrays of neighbor atom local indices
+ * \return                number of elements copied, -1 if idx is not a valid index */
+
+int lammps_neighlist_elements(void *handle, int idx, int nmax, int *iatoms, int *numneigh, int **neighbors) {
+  LAMMPS *  lmp = (LAMMPS *) handle;
+  Neighbor * neighbor = lmp->neighbor;
+
+  if (idx < 0 || idx >= neighbor->nlist) {
+    return -1;
+  }
+
+  NeighList * list = neighbor->lists[idx];
+  int n = (list->inum < nmax) ? list->inum : nmax;
+
+  for (int ii = 0; ii < n; ++ii) {
+    int i = list->ilist[ii];
+    iatoms[ii]    = i;
+    numneigh[ii]  = list->numneigh[i];
+    neighbors[ii] = list->firstneigh[i];
+  }
+  return n;
+}
+
 // ----------------------------------------------------------------------
 // Library functions for accessing LAMMPS configuration
 // ----------------------------------------------------------------------
@@ -4428,6 +4519,45 @@ int lammps_style_name(void *handle, const char *category, int idx,
 
 /* ---------------------------------------------------------------------- */
 
+/** Copy the names of all styles of a given category in the LAMMPS library.
+ *
+\verbatim embed:rst
+
+This function copies the names of all *category* styles into the provided
+C-style string buffer, each terminated by a null character, in the same
+order as they are returned by :cpp:func:`lammps_style_name`.  This way
+the list of styles needs to be assembled only once, instead of once per
+style.  The function returns the number of bytes required for all names.
+If that is larger than *buf_size*, only the names that fit completely
+into the buffer are copied, and the function can be called again with
+a sufficiently large buffer.
+
+\endverbatim
+ *
+ * \param handle   pointer to a previously created LAMMPS instance cast to ``void *``.
+ * \param category category of styles
+ * \param buffer   string buffer to copy the names of the styles to
+ * \param buf_size size of the provided string buffer
+ * \return number of bytes required for all names
+ */
+int lammps_style_names(void *handle, const char *category,
+                       char *buffer, int buf_size) {
+  LAMMPS *lmp = (LAMMPS *) handle;
+  Info info(lmp);
+  auto styles = info.get_available_styles(category);
+
+  int nbytes = 0;
+  for (auto &style : styles) {
+    int len = style.size() + 1;
+    if (nbytes + len > buf_size) buf_size = 0;
+    else memcpy(buffer + nbytes, style.c_str(), len);
+    nbytes += len;
+  }
+  return nbytes;
+}
+
+/* ---------------------------------------------------------------------- */
+
 /** Check if a specific ID exists in the current LAMMPS instance
  *
 \verbatim embed:rst
@@ -4600,6 +4730,67 @@ int lammps_id_name(void *handle, const char *category, int idx,
 
 /* ---------------------------------------------------------------------- */
 
+/** Copy the names of all IDs of a given category in the current LAMMPS instance.
+ *
+\verbatim embed:rst
+
+This function copies the names of all *category* IDs into the provided
+C-style string buffer, each terminated by a null character, in the same
+order as they are returned by :cpp:func:`lammps_id_name`.  The function
+returns the number of bytes required for all names.  If that is larger
+than *buf_size*, only the names that fit completely into the buffer are
+copied, and the function can be called again with a sufficiently large
+buffer.  Valid categories are the same as for :cpp:func:`lammps_id_count`.
+
+\endverbatim
+ *
+ * \param handle   pointer to a previously created LAMMPS instance cast to ``void *``.
+ * \param category category of IDs
+ * \param buffer   string buffer to copy the names of the IDs to
+ * \param buf_size size of the provided string buffer
+ * \return number of bytes required for all names
+ */
+int lammps_id_names(void *handle, const char *category,
+                    char *buffer, int buf_size) {
+  LAMMPS *lmp = (LAMMPS *) handle;
+  std::vector<const char *> ids;
+
+  if (strcmp(category,"compute") == 0) {
+    for (int i = 0; i < lmp->modify->ncompute; ++i)
+      ids.push_back(lmp->modify->compute[i]->id);
+  } else if (strcmp(category,"dump") == 0) {
+    for (int i = 0; i < lmp->output->ndump; ++i)
+      ids.push_back(lmp->output->dump[i]->id);
+  } else if (strcmp(category,"fix") == 0) {
+    for (int i = 0; i < lmp->modify->nfix; ++i)
+      ids.push_back(lmp->modify->fix[i]->id);
+  } else if (strcmp(category,"group") == 0) {
+    for (int i = 0; i < lmp->group->ngroup; ++i)
+      ids.push_back(lmp->group->names[i]);
+  } else if (strcmp(category,"molecule") == 0) {
+    for (int i = 0; i < lmp->atom->nmolecule; ++i)
+      ids.push_back(lmp->atom->molecules[i]->id);
+  } else if (strcmp(category,"region") == 0) {
+    for (int i = 0; i < lmp->domain->nregion; ++i)
+      ids.push_back(lmp->domain->regions[i]->id);
+  } else if (strcmp(category,"variable") == 0) {
+    for (int i = 0; i < lmp->input->variable->nvar; ++i)
+      ids.push_back(lmp->input->variable->names[i]);
+  }
+
+  int nbytes = 0;
+  for (auto id : ids) {
+    if (!id) continue;
+    int len = strlen(id) + 1;
+    if (nbytes + len > buf_size) buf_size = 0;
+    else memcpy(buffer + nbytes, id, len);
+    nbytes += len;
+  }
+  return nbytes;
+}
+
+/* ---------------------------------------------------------------------- */
+
 /** Count the number of loaded plugins
  *
 \verbatim embed:rst
@@ -141,6 +141,7 @@ void  *lammps_extract_atom(void *handle, const char *name);
 void *lammps_extract_compute(void *handle, char *id, int, int);
 void *lammps_extract_fix(void *handle, char *, int, int, int, int);
 void *lammps_extract_variable(void *handle, const char *, const char *);
+int   lammps_extract_variable_scalar(void *handle, const char *, double *);
 int   lammps_set_variable(void *, char *, char *);
 
 /* ----------------------------------------------------------------------
@@ -176,6 +177,7 @@ int lammps_find_fix_neighlist(void *handle, char *id, int request);
 int lammps_find_compute_neighlist(void *handle, char *id, int request);
 int lammps_neighlist_num_elements(void *handle, int idx);
 void lammps_neighlist_element_neighbors(void *handle, int idx, int element, int *iatom, int *numneigh, int **neighbors);
+int lammps_neighlist_elements(void *handle, int idx, int nmax, int *iatoms, int *numneigh, int **neighbors);
 
 /* ----------------------------------------------------------------------
  * Library functions for retrieving configuration information
@@ -200,10 +202,12 @@ int lammps_config_accelerator(const char *, const char *, const char *);
 int lammps_has_style(void *, const char *, const char *);
 int lammps_style_count(void *, const char *);
 int lammps_style_name(void *, const char *, int, char *, int);
+int lammps_style_names(void *, const char *, char *, int);
 
 int lammps_has_id(void *, const char *, const char *);
 int lammps_id_count(void *, const char *);
 int lammps_id_name(void *, const char *, int, char *, int);
+int lammps_id_names(void *, const char *, char *, int);
 
 int lammps_plugin_count();
 int lammps_plugin_name(int, char *, char *, int);
@@ -91,6 +91,7 @@ extern int    lammps_create_atoms(void *handle, int n, int *id, int *type,
 extern void *lammps_extract_compute(void *handle, char *id, int, int);
 extern void *lammps_extract_fix(void *handle, char *, int, int, int, int);
 extern void *lammps_extract_variable(void *handle, char *, char *);
+extern int   lammps_extract_variable_scalar(void *handle, const char *, double *);
 extern int   lammps_set_variable(void *, char *, char *);
 extern void lammps_gather(void *, char *, int, int, void *);
 extern void lammps_gather_concat(void *, char *, int, int, void *);
@@ -114,14 +115,17 @@ extern int lammps_config_has_exceptions();
 extern int lammps_has_style(void *, const char *, const char *);
 extern int lammps_style_count(void *, const char *);
 extern int lammps_style_name(void *, const char *, int, char *buffer, int buf_size);
+extern int lammps_style_names(void *, const char *, char *buffer, int buf_size);
 extern int lammps_has_id(void *, const char *, const char *);
 extern int lammps_id_count(void *, const char *);
 extern int lammps_id_name(void *, const char *, int, char *buffer, int buf_size);
+extern int lammps_id_names(void *, const char *, char *buffer, int buf_size);
 extern int lammps_find_pair_neighlist(void*, char *, int, int, int);
 extern int lammps_find_fix_neighlist(void*, char *, int);
 extern int lammps_find_compute_neighlist(void*, char *, int);
 extern int lammps_neighlist_num_elements(void*, int);
 extern void lammps_neighlist_element_neighbors(void *, int, int, int *, int *, int ** );
+extern int lammps_neighlist_elements(void *, int, int, int *, int *, int ** );
 /*
 extern int lammps_encode_image_flags(int ix, int iy, int iz);
 extern void lammps_decode_image_flags(int image, int *flags);
@@ -206,6 +210,7 @@ extern int    lammps_create_atoms(void *handle, int n, int64_t *id, int *type, *
 extern void *lammps_extract_compute(void *handle, char *id, int, int);
 extern void *lammps_extract_fix(void *handle, char *, int, int, int, int);
 extern void *lammps_extract_variable(void *handle, char *, char *);
+extern int   lammps_extract_variable_scalar(void *handle, const char *, double *);
 extern int   lammps_set_variable(void *, char *, char *);
 extern void lammps_gather(void *, char *, int, int, void *);
 extern void lammps_gather_concat(void *, char *, int, int, void *);
@@ -229,14 +234,17 @@ extern int lammps_config_has_exceptions();
 extern int lammps_has_style(void *, const char *, const char *);
 extern int lammps_style_count(void *, const char *);
 extern int lammps_style_name(void *, const char *, int, char *buffer, int buf_size);
+extern int lammps_style_names(void *, const char *, char *buffer, int buf_size);
 extern int lammps_has_id(void *, const char *, const char *);
 extern int lammps_id_count(void *, const char *);
 extern int lammps_id_name(void *, const char *, int, char *buffer, int buf_size);
+extern int lammps_id_names(void *, const char *, char *buffer, int buf_size);
 extern int lammps_find_pair_neighlist(void*, char *, int, int, int);
 extern int lammps_find_fix_neighlist(void*, char *, int);
 extern int lammps_find_compute_neighlist(void*, char *, int);
 extern int lammps_neighlist_num_elements(void*, int);
 extern void lammps_neighlist_element_neighbors(void *, int, int, int *, int *, int ** );
+extern int lammps_neighlist_elements(void *, int, int, int *, int *, int ** );
 /*
 extern int lammps_encode_image_flags(int ix, int iy, int iz);
 extern void lammps_decode_image_flags(int image, int *flags);
@@ -3,7 +3,9 @@
 #include "lammps.h"
 #include "library.h"
 #include "timer.h"
+#include <cstring>
 #include <string>
+#include <vector>
 
 #include "gmock/gmock.h"
 #include "gtest/gtest.h"
@@ -123,6 +125,23 @@ TEST_F(LibraryConfig, style_name)
     EXPECT_THAT(buf, StrEq(""));
 };
 
+TEST_F(LibraryConfig, style_names)
+{
+    char name[128];
+    int nbytes = lammps_style_names(lmp, "atom", nullptr, 0);
+    EXPECT_GT(nbytes, 0);
+    std::vector<char> buf(nbytes);
+    EXPECT_EQ(lammps_style_names(lmp, "atom", buf.data(), nbytes), nbytes);
+    int numstyles = lammps_style_count(lmp, "atom");
+    const char *ptr = buf.data();
+    for (int i = 0; i < numstyles; ++i) {
+        lammps_style_name(lmp, "atom", i, name, 128);
+        EXPECT_THAT(ptr, StrEq(name));
+        ptr += strlen(ptr) + 1;
+    }
+    EXPECT_EQ(ptr, buf.data() + nbytes);
+};
+
 TEST_F(LibraryConfig, has_id)
 {
     EXPECT_EQ(lammps_has_id(lmp, "compute", "thermo_temp"), 1);
@@ -180,6 +199,22 @@ TEST_F(LibraryConfig, id_name)
     EXPECT_THAT(buf, StrEq(""));
 };
 
+TEST_F(LibraryConfig, id_names)
+{
+    int nbytes = lammps_id_names(lmp, "compute", nullptr, 0);
+    EXPECT_EQ(nbytes, 35);
+    std::vector<char> buf(nbytes);
+    EXPECT_EQ(lammps_id_names(lmp, "compute", buf.data(), nbytes), nbytes);
+    EXPECT_THAT(buf.data(), StrEq("thermo_temp"));
+    EXPECT_THAT(buf.data() + 12, StrEq("thermo_press"));
+    EXPECT_THAT(buf.data() + 25, StrEq("thermo_pe"));
+    EXPECT_EQ(lammps_id_names(lmp, "group", buf.data(), nbytes), 9);
+    EXPECT_THAT(buf.data(), StrEq("all"));
+    EXPECT_THAT(buf.data() + 4, StrEq("none"));
+    EXPECT_EQ(lammps_id_names(lmp, "dump", buf.data(), nbytes), 0);
+    EXPECT_EQ(lammps_id_names(lmp, "xxx", buf.data(), nbytes), 0);
+};
+
 TEST_F(LibraryConfig, is_running)
 {
     EXPECT_EQ(lammps_is_running(lmp), 0);
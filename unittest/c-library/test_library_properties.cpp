@@ -4,6 +4,7 @@
 #include "library.h"
 #include "lmptype.h"
 #include <string>
+#include <vector>
 
 #include "gmock/gmock.h"
 #include "gtest/gtest.h"
@@ -313,6 +314,27 @@ TEST_F(LibraryProperties, global)
     EXPECT_DOUBLE_EQ((*d_ptr), 0.1);
 };
 
+TEST_F(LibraryProperties, extract_variable_scalar)
+{
+    if (!verbose) ::testing::internal::CaptureStdout();
+    lammps_command(lmp, "variable a equal 2.5");
+    lammps_command(lmp, "variable b equal v_a*2");
+    lammps_command(lmp, "variable c string xyz");
+    lammps_command(lmp, "variable d atom x*2");
+    if (!verbose) ::testing::internal::GetCapturedStdout();
+
+    double value = 0.0;
+    EXPECT_EQ(lammps_extract_variable_scalar(lmp, "a", &value), 0);
+    EXPECT_DOUBLE_EQ(value, 2.5);
+    EXPECT_EQ(lammps_extract_variable_scalar(lmp, "b", &value), 0);
+    EXPECT_DOUBLE_EQ(value, 5.0);
+    value = -1.0;
+    EXPECT_EQ(lammps_extract_variable_scalar(lmp, "c", &value), -1);
+    EXPECT_EQ(lammps_extract_variable_scalar(lmp, "d", &value), 1);
+    EXPECT_EQ(lammps_extract_variable_scalar(lmp, "xxx", &value), -1);
+    EXPECT_DOUBLE_EQ(value, -1.0);
+};
+
 class AtomProperties : public ::testing::Test {
 protected:
     void *lmp;
@@ -395,3 +417,40 @@ TEST_F(AtomProperties, position)
     EXPECT_DOUBLE_EQ(x[1][1], 0.1);
     EXPECT_DOUBLE_EQ(x[1][2], 0.1);
 }
+
+TEST_F(AtomProperties, neighlist_elements)
+{
+    if (!verbose) ::testing::internal::CaptureStdout();
+    lammps_command(lmp, "pair_style lj/cut 2.5");
+    lammps_command(lmp, "pair_coeff * * 1.0 1.0");
+    lammps_command(lmp, "run 0 post no");
+    if (!verbose) ::testing::internal::GetCapturedStdout();
+
+    int idx = lammps_find_pair_neighlist(lmp, (char *)"lj/cut", 1, 0, 0);
+    ASSERT_EQ(idx, 0);
+    int nelem = lammps_neighlist_num_elements(lmp, idx);
+    ASSERT_EQ(nelem, 2);
+
+    std::vector<int> iatoms(nelem), numneigh(nelem);
+    std::vector<int *> neighbors(nelem);
+    EXPECT_EQ(lammps_neighlist_elements(lmp, idx, nelem, iatoms.data(), numneigh.data(),
+                                        neighbors.data()),
+              nelem);
+    for (int i = 0; i < nelem; ++i) {
+        int iatom, num, *neigh;
+        lammps_neighlist_element_neighbors(lmp, idx, i, &iatom, &num, &neigh);
+        EXPECT_EQ(iatoms[i], iatom);
+        EXPECT_EQ(numneigh[i], num);
+        EXPECT_EQ(neighbors[i], neigh);
+    }
+
+    // at most nmax elements are copied
+    iatoms[1] = -1;
+    EXPECT_EQ(lammps_neighlist_elements(lmp, idx, 1, iatoms.data(), numneigh.data(),
+                                        neighbors.data()),
+              1);
+    EXPECT_EQ(iatoms[1], -1);
+    EXPECT_EQ(lammps_neighlist_elements(lmp, idx + 1, nelem, iatoms.data(), numneigh.data(),
+                                        neighbors.data()),
+              -1);
+}
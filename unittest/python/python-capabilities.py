@@ -106,6 +106,31 @@ class PythonCapabilities(unittest.TestCase):
         ids = self.lmp.available_ids('variable')
         self.assertIn('test', ids)
         self.assertEqual(len(ids),1)
+        self.assertIs(ids, self.lmp.available_ids('variable'))
+        self.lmp.command('variable test delete')
+        ids = self.lmp.available_ids('variable')
+        self.assertEqual(len(ids),0)
+
+    def test_available_id_ptr(self):
+        from ctypes import pythonapi, py_object, c_void_p, c_char_p
+        pythonapi.PyCapsule_New.restype = py_object
+        pythonapi.PyCapsule_New.argtypes = [c_void_p, c_char_p, c_void_p]
+        other = lammps(ptr=pythonapi.PyCapsule_New(self.lmp.lmp.value, None, None))
+        self.assertEqual(other.available_ids('variable'), [])
+        self.lmp.command('variable test index 1')
+        self.assertEqual(other.available_ids('variable'), ['test'])
+
+    def test_snapshot(self):
+        self.lmp.command('region box block 0 1 0 1 0 1')
+        self.lmp.command('create_box 1 box')
+        snapshot = self.lmp.snapshot()
+        self.assertIn('lj/cut', snapshot['styles']['pair'])
+        self.assertEqual(snapshot['ids']['region'], ['box'])
+        self.assertEqual(snapshot['ids']['group'], ['all'])
+        self.assertEqual(snapshot['ids']['compute'], ['thermo_temp', 'thermo_press', 'thermo_pe'])
+        self.assertEqual(snapshot['plugins'], self.lmp.available_plugins(''))
+        self.assertIs(snapshot['styles']['pair'], self.lmp.available_styles('pair'))
+        self.assertIs(snapshot['ids']['region'], self.lmp.available_ids('region'))
 
     def test_is_running(self):
         self.assertFalse(self.lmp.is_running)
@@ -126,6 +151,7 @@ class PythonCapabilities(unittest.TestCase):
     def test_accelerator_config(self):
 
         settings = self.lmp.accelerator_config
+        self.assertEqual(settings, self.lmp.accelerator_config)
         if self.cmake_cache['PKG_USER-OMP']:
             if self.cmake_cache['BUILD_OMP']:
                 self.assertIn('openmp',settings['USER-OMP']['api'])
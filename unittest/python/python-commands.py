@@ -1,6 +1,6 @@
 
 import sys,os,unittest
-from lammps import lammps, LMP_VAR_ATOM
+from lammps import lammps, LMP_VAR_ATOM, LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR
 
 class PythonCommand(unittest.TestCase):
 
@@ -77,6 +77,47 @@ create_atoms 1 single &
         natoms = self.lmp.get_natoms()
         self.assertEqual(natoms,2)
 
+    def testCommandsListMixed(self):
+        """Test executing commands from list of strings and bytes"""
+        natoms = self.lmp.get_natoms()
+        self.assertEqual(natoms,0)
+        cmds = self.demo_input.splitlines()+[x.encode() for x in self.cont_input.splitlines()]
+        self.lmp.commands_list(cmds)
+        natoms = self.lmp.get_natoms()
+        self.assertEqual(natoms,2)
+
+    def testCommandsBytes(self):
+        """Test passing commands and keywords as bytes"""
+        for cmd in self.demo_input.splitlines():
+            self.lmp.command(cmd.encode())
+        self.assertEqual(self.lmp.get_natoms(),1)
+        self.assertEqual(self.lmp.get_thermo(b"vol"),8.0)
+        self.assertEqual(self.lmp.extract_setting(b"box_exist"),1)
+        self.assertEqual(self.lmp.extract_global(b"boxhi"),[2.0,2.0,2.0])
+        self.assertEqual(self.lmp.extract_global(b"nlocal"),1)
+        self.assertEqual(self.lmp.extract_atom(b"x")[0][2],1.5)
+
+    def testCommandsBytearray(self):
+        """Test passing commands and keywords as bytearray"""
+        lines = self.demo_input.splitlines()
+        self.lmp.command(bytearray(lines[0].encode()))
+        self.lmp.commands_list([bytearray(cmd.encode()) for cmd in lines[1:3]])
+        self.lmp.commands_string(bytearray("\n".join(lines[3:]).encode()))
+        self.assertEqual(self.lmp.get_natoms(),1)
+        self.assertEqual(self.lmp.extract_setting(bytearray(b"box_exist")),1)
+        self.assertEqual(self.lmp.extract_global(bytearray(b"nlocal")),1)
+        self.assertEqual(self.lmp.extract_atom(bytearray(b"x"))[0][2],1.5)
+        self.assertTrue(self.lmp.has_id(bytearray(b"region"),bytearray(b"box")))
+        self.assertIn('box',self.lmp.available_ids(bytearray(b"region")))
+
+    def testCommandsListInvalid(self):
+        """Test that non-string entries in a command list are rejected"""
+        with self.assertRaisesRegex(TypeError, "not 42"):
+            self.lmp.commands_list(["region box block 0 2 0 2 0 2", 42])
+        with self.assertRaisesRegex(TypeError, "not None"):
+            self.lmp.commands_list([None])
+        self.assertFalse(self.lmp.has_id("region","box"))
+
     def testCommandsString(self):
         """Test executing block of commands from string"""
         natoms = self.lmp.get_natoms()
@@ -111,9 +152,21 @@ create_atoms 1 single &
         self.lmp.command("neighbor 0.1 bin")
         self.lmp.command("neigh_modify every 20 delay 0 check no")
 
+        # the index is cached, but must be looked up again after a run,
+        # also through other wrappers of the same LAMMPS instance
+        from ctypes import pythonapi, py_object, c_void_p, c_char_p
+        pythonapi.PyCapsule_New.restype = py_object
+        pythonapi.PyCapsule_New.argtypes = [c_void_p, c_char_p, c_void_p]
+        other = lammps(ptr=pythonapi.PyCapsule_New(self.lmp.lmp.value, None, None))
+        self.assertEqual(self.lmp.find_pair_neighlist("lj/cut"), -1)
+        self.assertEqual(other.find_pair_neighlist("lj/cut"), -1)
+        other.command("run 0")
+        self.assertEqual(self.lmp.find_pair_neighlist("lj/cut"), 0)
         self.lmp.command("run 0")
 
         self.assertEqual(self.lmp.find_pair_neighlist("lj/cut"), 0)
+        self.assertEqual(self.lmp.find_pair_neighlist("lj/cut"), 0)
+        self.assertEqual(self.lmp.find_pair_neighlist("lj/cut", request=1), -1)
         nlist = self.lmp.get_neighlist(0)
         self.assertEqual(len(nlist), 2)
         atom_i, numneigh_i, neighbors_i = nlist[0]
@@ -127,6 +180,12 @@ create_atoms 1 single &
 
         self.assertEqual(1, neighbors_i[0])
 
+        iatoms, numneigh, neighbors = self.lmp.get_neighlist_elements(0)
+        self.assertEqual(list(iatoms), [0, 1])
+        self.assertEqual(list(numneigh), [1, 0])
+        self.assertEqual(neighbors[0][0], 1)
+        self.assertEqual(len(self.lmp.get_neighlist_elements(1)[0]), 0)
+
     def test_extract_box_non_periodic(self):
         self.lmp.command("boundary f f f")
         self.lmp.command("region box block 0 2 0 2 0 2")
@@ -192,6 +251,27 @@ create_atoms 1 single &
         self.assertEqual(periodicity, [1, 1, 1])
         self.assertEqual(box_change, 0)
 
+    def test_image_flags(self):
+        image = self.lmp.encode_image_flags(1, -2, 3)
+        self.assertEqual(self.lmp.decode_image_flags(image), [1, -2, 3])
+        flags = self.lmp.decode_image_flags(self.lmp.encode_image_flags(0, 0, -1))
+        self.assertEqual(flags, [0, 0, -1])
+        self.assertIs(type(flags[0]), int)
+
+    def test_extract_compute_fix_global_scalar(self):
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+        self.lmp.command("mass 1 1.0")
+        self.lmp.command("create_atoms 1 single 1.0 1.0 1.0")
+        self.lmp.command("velocity all set 1.0 0.0 0.0")
+        self.lmp.command("compute ke all ke")
+        self.lmp.command("fix ke all ave/time 1 1 1 c_ke")
+        self.lmp.command("run 0 post no")
+        self.assertEqual(self.lmp.extract_compute("ke", LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR), 0.5)
+        self.assertEqual(self.lmp.extract_fix("ke", LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR), 0.5)
+        self.assertIsNone(self.lmp.extract_compute("none", LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR))
+        self.assertIsNone(self.lmp.extract_fix("none", LMP_STYLE_GLOBAL, LMP_TYPE_SCALAR))
+
     def test_extract_variable_equalstyle(self):
         self.lmp.command("variable a equal 100")
         a = self.lmp.extract_variable("a")
@@ -201,6 +281,28 @@ create_atoms 1 single &
         a = self.lmp.extract_variable("a")
         self.assertEqual(a, 3.14)
 
+        self.lmp.command("variable b string xyz")
+        self.assertEqual(self.lmp.extract_variable("b"), None)
+        self.assertEqual(self.lmp.extract_variable("c"), None)
+
+        # older libraries without lammps_extract_variable_scalar()
+        self.lmp._has_variable_scalar = False
+        self.assertEqual(self.lmp.extract_variable("a"), 3.14)
+        self.assertEqual(self.lmp.extract_variable("c"), None)
+
+    def test_bytes_arguments(self):
+        self.lmp.command("variable a string xyz")
+        self.lmp.command("variable b equal v_a")
+        self.assertEqual(self.lmp.set_variable(b"a", b"1.5"), 0)
+        self.assertEqual(self.lmp.extract_variable(b"b"), 1.5)
+        self.assertEqual(self.lmp.set_variable("a", 2.5), 0)
+        self.assertEqual(self.lmp.extract_variable("b"), 2.5)
+        self.assertEqual(self.lmp.set_variable(bytearray(b"a"), bytearray(b"3.5")), 0)
+        self.assertEqual(self.lmp.extract_variable(bytearray(b"b")), 3.5)
+        self.assertTrue(self.lmp.has_id(b"variable", b"a"))
+        self.assertTrue(self.lmp.has_style(b"pair", b"lj/cut"))
+        self.assertEqual(self.lmp.find_pair_neighlist(b"lj/cut"), -1)
+
     def test_extract_variable_atomstyle(self):
         self.lmp.command("units lj")
         self.lmp.command("atom_style atomic")
@@ -221,6 +323,30 @@ create_atoms 1 single &
         a = self.lmp.extract_variable("a", "all", LMP_VAR_ATOM)
         self.assertEqual(a[0], x[0]*x[0]+x[1]*x[1]+x[2]*x[2])
         self.assertEqual(a[1], x[3]*x[3]+x[4]*x[4]+x[5]*x[5])
+        # requesting an atom-style variable as equal-style returns the first value
+        self.assertEqual(self.lmp.extract_variable("a"), a[0])
+
+    def test_gather_many(self):
+        self.lmp.command("units lj")
+        self.lmp.command("atom_style atomic")
+        self.lmp.command("atom_modify map array")
+        self.lmp.command("boundary f f f")
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+
+        x = [
+          1.0, 1.0, 1.0,
+          1.0, 1.0, 1.5
+        ]
+
+        types = [1, 1]
+
+        self.assertEqual(self.lmp.create_atoms(2, id=None, type=types, x=x), 2)
+        pos, vel = self.lmp.gather_many(["x", "v"], 1, 3)
+        self.assertEqual(pos[:], x)
+        self.assertEqual(vel[:], [0.0]*6)
+        self.assertEqual(pos[:], self.lmp.gather("x", 1, 3)[:])
+        self.assertEqual(self.lmp.gather_many(["x"], 2, 3), None)
 
     def test_get_thermo(self):
         self.lmp.command("units lj")
@@ -2,7 +2,7 @@ import sys,os,unittest
 from lammps import lammps, LAMMPS_INT, LMP_STYLE_GLOBAL, LMP_STYLE_LOCAL, \
                    LMP_STYLE_ATOM, LMP_TYPE_VECTOR, LMP_TYPE_SCALAR, LMP_TYPE_ARRAY, \
                    LMP_VAR_ATOM
-from ctypes import c_void_p
+from ctypes import c_double, c_void_p
 
 try:
     import numpy
@@ -137,6 +137,37 @@ class PythonNumpy(unittest.TestCase):
         self.assertTrue((x[1] == (1.0, 1.0, 1.5)).all())
         self.assertEqual(len(v), 2)
 
+    def testCreateAtoms(self):
+        self.lmp.command("units lj")
+        self.lmp.command("atom_style atomic")
+        self.lmp.command("atom_modify map array")
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+
+        # arrays with internal data types are used directly
+        ids = numpy.array([5, 7], dtype=numpy.dtype(self.lmp.c_tagint))
+        types = numpy.array([1, 1], dtype=numpy.intc)
+        x = numpy.array([[1.0, 1.0, 1.0], [1.0, 1.0, 1.5]])
+        v = numpy.zeros((2, 3))
+        self.assertEqual(self.lmp.create_atoms(2, id=ids, type=types, x=x, v=v), 2)
+
+        # other arrays are converted
+        ids = numpy.array([8], dtype=numpy.int8)
+        x = numpy.array([0.5, 0.5, 0.5], dtype=numpy.float32)
+        self.assertEqual(self.lmp.create_atoms(1, id=ids, type=[1], x=x), 1)
+
+        # insufficient data
+        self.assertEqual(self.lmp.create_atoms(2, id=None, type=types, x=x), 0)
+        self.assertEqual(self.lmp.create_atoms(1, id=None, type=1, x=x), 0)
+        self.assertEqual(self.lmp.create_atoms(1, id=None, type=["a"], x=x), 0)
+
+        self.assertEqual(self.lmp.extract_global("nlocal"), 3)
+        ident = self.lmp.numpy.extract_atom("id")
+        self.assertEqual(ident[:, 0].tolist(), [5, 7, 8])
+        x = self.lmp.numpy.extract_atom("x")
+        self.assertEqual(x[1].tolist(), [1.0, 1.0, 1.5])
+        self.assertEqual(x[2].tolist(), [0.5, 0.5, 0.5])
+
     def testNeighborList(self):
         self.lmp.command("units lj")
         self.lmp.command("atom_style atomic")
@@ -180,6 +211,113 @@ class PythonNumpy(unittest.TestCase):
         self.assertIn(1, neighbors_i)
         self.assertNotIn(0, neighbors_j)
 
+        atom_i, neighbors_i = nlist.get_element_arrays(0)
+        self.assertEqual(atom_i, 0)
+        self.assertEqual(neighbors_i.shape, (1,))
+        self.assertEqual(neighbors_i.dtype, numpy.intc)
+        self.assertTrue(neighbors_i.flags['C_CONTIGUOUS'])
+        self.assertEqual(neighbors_i.tolist(), [1])
+        atom_j, neighbors_j = nlist.get_element_arrays(1)
+        self.assertEqual(atom_j, 1)
+        self.assertEqual(neighbors_j.shape, (0,))
+        self.assertEqual(neighbors_j.dtype, numpy.intc)
+
+        iatoms, neighbors = self.lmp.numpy.get_neighlist_elements(0)
+        self.assertEqual(iatoms.tolist(), [0, 1])
+        self.assertEqual([n.tolist() for n in neighbors], [[1], []])
+        self.assertEqual(neighbors[0].dtype, numpy.intc)
+
+    def testExtractBox(self):
+        self.lmp.command("boundary p p f")
+        self.lmp.command("region box block -1 2 0 3 1 5")
+        self.lmp.command("create_box 1 box")
+        boxlo, boxhi, xy, yz, xz, periodicity, box_change = self.lmp.numpy.extract_box()
+        self.assertIs(type(boxlo), numpy.ndarray)
+        self.assertEqual(boxlo.tolist(), [-1.0, 0.0, 1.0])
+        self.assertEqual(boxhi.tolist(), [2.0, 3.0, 5.0])
+        self.assertEqual((xy, yz, xz), (0.0, 0.0, 0.0))
+        self.assertEqual(periodicity.tolist(), [1, 1, 0])
+        self.assertEqual(box_change, 0)
+        self.assertEqual(boxlo.tolist(), self.lmp.extract_box()[0])
+
+    def testGather(self):
+        self.lmp.command("units lj")
+        self.lmp.command("atom_style atomic")
+        self.lmp.command("atom_modify map array")
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+        self.assertEqual(self.lmp.numpy.gather_atoms("x", 1, 3).shape, (0,))
+        self.assertEqual(self.lmp.numpy.gather_atoms_concat("x", 1, 3).shape, (0,))
+        self.assertEqual(self.lmp.numpy.gather("x", 1, 3).shape, (0,))
+        self.assertEqual(self.lmp.numpy.gather_concat("x", 1, 3).shape, (0,))
+        self.assertEqual(self.lmp.gather_atoms("x", 1, 3)[:], [])
+
+        x = [1.0, 1.0, 1.0, 1.0, 1.0, 1.5]
+        self.assertEqual(self.lmp.create_atoms(2, id=[2, 1], type=[1, 1], x=x), 2)
+
+        pos = self.lmp.numpy.gather_atoms("x", 1, 3)
+        self.assertIs(type(pos), numpy.ndarray)
+        self.assertEqual(pos.tolist(), x[3:] + x[:3])
+        self.assertEqual(pos.tolist(), self.lmp.gather_atoms("x", 1, 3)[:])
+        self.assertEqual(self.lmp.numpy.gather("x", 1, 3).tolist(), pos.tolist())
+        types = self.lmp.numpy.gather_atoms("type", 0, 1)
+        self.assertEqual(types.dtype, numpy.intc)
+        self.assertEqual(types.tolist(), [1, 1])
+        pos = self.lmp.numpy.gather_subset("x", 1, 3, 1, [2])
+        self.assertEqual(pos.tolist(), x[:3])
+        self.assertEqual(self.lmp.numpy.gather_atoms("x", 2, 3), None)
+
+    def testScatter(self):
+        self.lmp.command("units lj")
+        self.lmp.command("atom_style atomic")
+        self.lmp.command("atom_modify map array")
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+        x = [1.0, 1.0, 1.0, 1.0, 1.0, 1.5]
+        self.assertEqual(self.lmp.create_atoms(2, id=None, type=[1, 1], x=x), 2)
+
+        pos = numpy.array([[0.5, 0.5, 0.5], [1.5, 1.5, 1.5]])
+        self.lmp.scatter_atoms("x", 1, 3, pos)
+        self.assertEqual(self.lmp.numpy.gather_atoms("x", 1, 3).tolist(), pos.ravel().tolist())
+        self.lmp.scatter_subset("x", 1, 3, 1, numpy.array([2]), numpy.array([0.25, 0.25, 0.25]))
+        self.assertEqual(self.lmp.numpy.gather("x", 1, 3)[3:].tolist(), [0.25, 0.25, 0.25])
+        self.lmp.scatter("x", 1, 3, [1.0]*6)
+        self.assertEqual(self.lmp.numpy.gather("x", 1, 3).tolist(), [1.0]*6)
+        # non-contiguous arrays are copied, ctypes arrays are used directly
+        self.lmp.scatter("x", 1, 3, numpy.arange(0.0, 1.2, 0.1)[::2])
+        self.assertEqual(self.lmp.numpy.gather("x", 1, 3).tolist(),
+                         numpy.arange(0.0, 1.2, 0.1)[::2].tolist())
+        self.lmp.scatter_atoms("x", 1, 3, (c_double*6)(*x))
+        self.assertEqual(self.lmp.numpy.gather_atoms("x", 1, 3).tolist(), x)
+
+    def testFixExternalCallback(self):
+        self.lmp.command("units lj")
+        self.lmp.command("atom_style atomic")
+        self.lmp.command("atom_modify map array")
+        self.lmp.command("region box block 0 2 0 2 0 2")
+        self.lmp.command("create_box 1 box")
+        self.lmp.command("mass 1 1.0")
+        x = [1.0, 1.0, 1.0, 1.0, 1.0, 1.5]
+        self.assertEqual(self.lmp.create_atoms(2, id=None, type=[1, 1], x=x), 2)
+        self.lmp.command("fix ext all external pf/callback 1 1")
+
+        self.lmp.command("fix nve all nve")
+
+        calls = []
+        positions = []
+        def callback(caller, ntimestep, nlocal, tag, x, f):
+            calls.append((caller, ntimestep, nlocal, tag[:, 0].tolist(), x.shape))
+            positions.append(x.copy())
+            f.fill(1.0)
+
+        self.lmp.set_fix_external_callback("ext", callback, "data")
+        self.lmp.command("run 2 post no")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0], ("data", 0, 2, [1, 2], (2, 3)))
+        self.assertEqual(calls[-1][1], 2)
+        self.assertTrue((positions[2] > positions[1]).all())
+        self.assertEqual(positions[-1].tolist(), self.lmp.numpy.extract_atom("x").tolist())
+
     def test_extract_variable_equalstyle(self):
         self.lmp.command("variable a equal 100")
         a = self.lmp.numpy.extract_variable("a")
@@ -45,10 +45,35 @@ class PythonOpen(unittest.TestCase):
 
     def testWithArgs(self):
         """Create LAMMPS instance with a few arguments"""
-        lmp=lammps(name=self.machine,
-                   cmdargs=['-nocite','-sf','opt','-log','none'])
+        args=['-nocite','-sf','opt','-log','none']
+        lmp=lammps(name=self.machine,cmdargs=args)
         self.assertIsNot(lmp.lmp,None)
         self.assertEqual(lmp.opened,1)
+        self.assertEqual(args,['-nocite','-sf','opt','-log','none'])
+
+    def testMultipleInstances(self):
+        """Create two LAMMPS instances sharing the same library handle"""
+        lmp1=lammps(name=self.machine,cmdargs=['-nocite','-log','none'])
+        lmp2=lammps(name=self.machine,cmdargs=['-nocite','-log','none'])
+        self.assertIs(lmp1.lib,lmp2.lib)
+        self.assertNotEqual(lmp1.lmp.value,lmp2.lmp.value)
+        self.assertIs(lmp1._fast_lib,lmp2._fast_lib)
+        lmp1.command("region box block 0 1 0 1 0 1")
+        lmp1.command("create_box 1 box")
+        self.assertEqual(lmp1.extract_global("nlocal"),0)
+        self.assertEqual(lmp1.get_thermo("vol"),1.0)
+        self.assertEqual(lmp2.extract_setting("box_exist"),0)
+        lmp1.close()
+        lmp2.close()
+        self.assertIsNone(lmp1._fast_lmp)
+        self.assertIsNone(lmp2._fast_lmp)
+
+    def testLibraryPathNotCached(self):
+        """Only cache library paths of files that were found"""
+        from lammps import core
+        name = "no_such_machine"
+        self.assertEqual(core._library_path(name),"liblammps_" + name + core._LIB_EXT)
+        self.assertNotIn(name,core._library_paths)
 
     @unittest.skipIf(not (has_mpi and has_mpi4py),"Skipping MPI test since LAMMPS is not parallel or mpi4py is not found")
     def testWithMPI(self):